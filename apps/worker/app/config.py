@@ -13,6 +13,9 @@ class Settings(BaseSettings):
     
     # Database
     database_url: str = Field(..., env='DATABASE_URL')
+    db_pool_min: int = Field(1, env='DB_POOL_MIN')  # connections opened up front
+    db_pool_max: int = Field(5, env='DB_POOL_MAX')  # hard cap on open connections, per process (x WEB_CONCURRENCY)
+    db_acquire_timeout_s: float = Field(10.0, env='DB_ACQUIRE_TIMEOUT_S')  # wait for a free connection
     
     # OpenRouteService - REQUIRED for route generation
     # Will use a default empty string if not set, but will warn
@@ -47,11 +50,15 @@ class Settings(BaseSettings):
     poll_interval: int = Field(30, env='POLL_INTERVAL')  # seconds
     job_timeout: int = Field(3600, env='JOB_TIMEOUT')  # seconds
     max_retries: int = Field(3, env='MAX_RETRIES')
+    job_batch_size: int = Field(1, env='JOB_BATCH_SIZE')  # jobs claimed per poll
+    poll_min_interval: float = Field(0.5, env='POLL_MIN_INTERVAL')  # idle backoff starts here, doubles to poll_interval
+    max_bg_jobs: int = Field(8, env='MAX_BG_JOBS')  # concurrent finite background jobs (long-lived services don't count)
     
     # ORS rate limiting
     ors_timeout: int = Field(30, env='ORS_TIMEOUT')  # seconds per call
     ors_max_retries: int = Field(3, env='ORS_MAX_RETRIES')
     ors_retry_delay: float = Field(1.0, env='ORS_RETRY_DELAY')  # base delay in seconds
+    ors_max_concurrency: int = Field(4, env='ORS_MAX_CONCURRENCY')  # in-flight routing calls per connector
     
     # Route generation settings
     max_gap_meters: float = Field(30.0, env='MAX_GAP_METERS')  # max allowed gap in route
@@ -3,13 +3,14 @@ Database connection and models
 """
 
 import logging
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 import json
 
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from psycopg2.pool import SimpleConnectionPool
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from contextlib import contextmanager
 
 from app.config import settings
@@ -21,7 +22,10 @@ class Database:
     """Database connection manager"""
     
     def __init__(self):
-        self.pool: Optional[SimpleConnectionPool] = None
+        self.pool: Optional[ThreadedConnectionPool] = None
+        # Bounds checkouts to the pool size so callers wait instead of failing.
+        # The wait blocks its thread: call these methods from an executor, never the event loop
+        self._slots = threading.BoundedSemaphore(settings.db_pool_max)
         self._connect()
     
     def _connect(self):
@@ -41,8 +45,9 @@ class Database:
                 else:
                     db_url += '?sslmode=require'
             
-            self.pool = SimpleConnectionPool(
-                1, 5,  # min and max connections
+            # Thread-safe: endpoints run queries in the default executor
+            self.pool = ThreadedConnectionPool(
+                settings.db_pool_min, settings.db_pool_max,
                 db_url,
                 cursor_factory=RealDictCursor
             )
@@ -54,7 +59,10 @@ class Database:
     
     @contextmanager
     def get_connection(self):
-        """Get a connection from the pool"""
+        """Get a connection from the pool, waiting up to db_acquire_timeout_s for one"""
+        if not self._slots.acquire(timeout=settings.db_acquire_timeout_s):
+            raise PoolError(f"No database connection free after {settings.db_acquire_timeout_s}s")
+        
         conn = None
         try:
             conn = self.pool.getconn()
@@ -68,21 +76,33 @@ class Database:
         finally:
             if conn:
                 self.pool.putconn(conn)
+            self._slots.release()
+    
+    def close_pool(self):
+        """Close every pooled connection"""
+        if self.pool and not self.pool.closed:
+            self.pool.closeall()
+            logger.info("Database connection pool closed")
     
     def get_pending_job(self) -> Optional[Dict[str, Any]]:
         """Fetch a pending job and mark it as processing"""
+        jobs = self.get_pending_jobs(1)
+        return jobs[0] if jobs else None
+    
+    def get_pending_jobs(self, limit: int) -> List[Dict[str, Any]]:
+        """Claim up to limit pending jobs (oldest first) in one round-trip, marking them processing"""
         with self.get_connection() as conn:
             with conn.cursor() as cur:
-                # Find and lock a pending job
+                # Find and lock pending jobs
                 cur.execute("""
                     UPDATE coverage_routes
                     SET status = 'processing',
                     updated_at = NOW()
-                    WHERE id = (
+                    WHERE id IN (
                         SELECT id FROM coverage_routes
                         WHERE status IN ('pending', 'queued')
                         ORDER BY created_at ASC
-                        LIMIT 1
+                        LIMIT %s
                         FOR UPDATE SKIP LOCKED
                     )
                     RETURNING 
@@ -91,13 +111,12 @@ class Database:
                         profile,
                         params,
                         created_at
-                """)
+                """, (limit,))
                 
-                job = cur.fetchone()
-                if job:
+                jobs = sorted((dict(job) for job in cur.fetchall()), key=lambda job: job['created_at'])
+                for job in jobs:
                     logger.info(f"Claimed job: {job['id']}")
-                    return dict(job)
-                return None
+                return jobs
     
     def get_area_data(self, area_id: str) -> Optional[Dict[str, Any]]:
         """Fetch area details including geometry"""
@@ -0,0 +1,56 @@
+"""
+Growable coordinate buffer for assembling long routes
+"""
+
+from typing import List, Sequence
+
+import numpy as np
+
+
+class CoordBuffer:
+    """
+    (N, 2) float64 lon/lat buffer grown by amortized doubling.
+    Points are stored packed rather than as one Python list per point,
+    so the assembled route can be handed to array passes without copying.
+    """
+    
+    def __init__(self, capacity: int = 1024):
+        self._buf = np.empty((max(capacity, 1), 2), dtype=np.float64)
+        self._n = 0
+    
+    def __len__(self) -> int:
+        return self._n
+    
+    def _reserve(self, extra: int):
+        """Make room for extra more points, doubling the capacity as needed"""
+        
+        needed = self._n + extra
+        if needed <= self._buf.shape[0]:
+            return
+        
+        capacity = self._buf.shape[0]
+        while capacity < needed:
+            capacity *= 2
+        grown = np.empty((capacity, 2), dtype=np.float64)
+        grown[:self._n] = self._buf[:self._n]
+        self._buf = grown
+    
+    def extend(self, coords: Sequence[Sequence[float]]):
+        """Append points from a list of [lon, lat] pairs or an (N, 2) array"""
+        
+        arr = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        self._reserve(arr.shape[0])
+        self._buf[self._n:self._n + arr.shape[0]] = arr
+        self._n += arr.shape[0]
+    
+    def last(self) -> List[float]:
+        """Last point as [lon, lat]"""
+        
+        if not self._n:
+            raise IndexError("last() on empty CoordBuffer")
+        return self._buf[self._n - 1].tolist()
+    
+    def array(self) -> np.ndarray:
+        """(N, 2) view of the points; valid until the next extend"""
+        
+        return self._buf[:self._n]
@@ -0,0 +1,185 @@
+"""
+Numba-accelerated distance kernels for bulk route geometry work
+"""
+
+import logging
+import math
+
+import numpy as np
+from pyproj import Geod
+
+logger = logging.getLogger(__name__)
+
+# Mean Earth radius for spherical (haversine) distances
+EARTH_RADIUS_M = 6371000.0
+
+# Geodesic calculator for ellipsoidal length reporting
+GEOD = Geod(ellps="WGS84")
+
+# Row block size for all-pairs distance tiles (keeps the working set in L2)
+MATRIX_TILE_ROWS = 1024
+
+# Polylines with at least this many segments are measured across threads
+PARALLEL_MIN_SEGMENTS = 65536
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.info("Numba not available - falling back to NumPy for bulk distances")
+
+
+if NUMBA_AVAILABLE:
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def _hav(lon1, lat1, lon2, lat2):
+        """Haversine distance in meters between two lon/lat points"""
+        rlat1 = math.radians(lat1)
+        rlat2 = math.radians(lat2)
+        dlat = rlat2 - rlat1
+        dlon = math.radians(lon2 - lon1)
+        a = math.sin(dlat * 0.5) ** 2 + math.cos(rlat1) * math.cos(rlat2) * math.sin(dlon * 0.5) ** 2
+        return 2.0 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+    # Scalar entry point for call sites that can't batch (interleaved with awaits)
+    haversine = _hav
+
+    @njit(cache=True, fastmath=True, nogil=True)
+    def haversine_arr(lon1, lat1, lon2, lat2):
+        """Element-wise haversine distance in meters over equal-length arrays"""
+        n = lon1.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        for i in range(n):
+            out[i] = _hav(lon1[i], lat1[i], lon2[i], lat2[i])
+        return out
+
+    @njit(cache=True, fastmath=True, nogil=True, parallel=True)
+    def haversine_segments(coords):
+        """Length in meters of each consecutive segment of an (N, 2) lon/lat polyline, across threads"""
+        n = coords.shape[0] - 1
+        out = np.empty(n, dtype=np.float64)
+        for i in prange(n):
+            out[i] = _hav(coords[i, 0], coords[i, 1], coords[i + 1, 0], coords[i + 1, 1])
+        return out
+    
+    @njit(cache=True, fastmath=True, nogil=True, parallel=True)
+    def total_length(coords):
+        """Total length in meters of an (N, 2) lon/lat polyline"""
+        total = 0.0
+        for i in prange(coords.shape[0] - 1):
+            total += _hav(coords[i, 0], coords[i, 1], coords[i + 1, 0], coords[i + 1, 1])
+        return total
+
+    @njit(cache=True, fastmath=True, nogil=True, parallel=True)
+    def haversine_pairwise(coords1, coords2):
+        """All-pairs haversine distance in meters between (N, 2) and (M, 2) lon/lat arrays"""
+        n = coords1.shape[0]
+        m = coords2.shape[0]
+        out = np.empty((n, m), dtype=np.float64)
+        for i in prange(n):
+            for j in range(m):
+                out[i, j] = _hav(coords1[i, 0], coords1[i, 1], coords2[j, 0], coords2[j, 1])
+        return out
+
+else:
+
+    def haversine(lon1, lat1, lon2, lat2):
+        """Haversine distance in meters between two lon/lat points"""
+        rlat1 = math.radians(lat1)
+        rlat2 = math.radians(lat2)
+        a = math.sin((rlat2 - rlat1) * 0.5) ** 2 + math.cos(rlat1) * math.cos(rlat2) * math.sin(math.radians(lon2 - lon1) * 0.5) ** 2
+        return 2.0 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+    def haversine_arr(lon1, lat1, lon2, lat2):
+        """Element-wise haversine distance in meters over equal-length arrays"""
+        rlat1 = np.radians(lat1)
+        rlat2 = np.radians(lat2)
+        dlat = rlat2 - rlat1
+        dlon = np.radians(np.asarray(lon2) - np.asarray(lon1))
+        a = np.sin(dlat * 0.5) ** 2 + np.cos(rlat1) * np.cos(rlat2) * np.sin(dlon * 0.5) ** 2
+        return 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+
+    def haversine_segments(coords):
+        """Length in meters of each consecutive segment of an (N, 2) lon/lat polyline"""
+        return haversine_arr(coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1])
+    
+    def total_length(coords):
+        """Total length in meters of an (N, 2) lon/lat polyline"""
+        if coords.shape[0] < 2:
+            return 0.0
+        return float(segment_lengths(coords).sum())
+
+    def haversine_pairwise(coords1, coords2):
+        """All-pairs haversine distance in meters between (N, 2) and (M, 2) lon/lat arrays"""
+        return haversine_matrix(coords1, coords2)
+
+
+def segment_lengths(coords: np.ndarray) -> np.ndarray:
+    """Length in meters of each consecutive segment of an (N, 2) lon/lat polyline"""
+    if coords.shape[0] < 2:
+        return np.empty(0, dtype=np.float64)
+    if coords.shape[0] > PARALLEL_MIN_SEGMENTS:
+        # One fused pass split across cores; below this, thread start-up dominates
+        return haversine_segments(np.ascontiguousarray(coords, dtype=np.float64))
+    return haversine_arr(coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1])
+
+
+def geodesic_length(coords: np.ndarray) -> float:
+    """
+    Ellipsoidal (WGS84) length in meters of an (N, 2) lon/lat polyline.
+    Used for reported route length; haversine is enough for gap checks.
+    """
+    if coords.shape[0] < 2:
+        return 0.0
+    return float(GEOD.line_length(coords[:, 0], coords[:, 1]))
+
+
+def haversine_matrix(coords1: np.ndarray, coords2: np.ndarray) -> np.ndarray:
+    """
+    All-pairs haversine distance in meters between (N, 2) and (M, 2) lon/lat arrays.
+    Returns an (N, M) matrix computed with NumPy broadcasting, MATRIX_TILE_ROWS
+    rows at a time so the temporaries stay cache-sized instead of N x M each.
+    """
+    lons2 = np.radians(coords2[:, 0])[None, :]
+    lats2 = np.radians(coords2[:, 1])[None, :]
+    cos_lats2 = np.cos(lats2)
+    
+    out = np.empty((coords1.shape[0], coords2.shape[0]), dtype=np.float64)
+    for start in range(0, coords1.shape[0], MATRIX_TILE_ROWS):
+        tile = coords1[start:start + MATRIX_TILE_ROWS]
+        lons1 = np.radians(tile[:, 0])[:, None]
+        lats1 = np.radians(tile[:, 1])[:, None]
+        
+        a = np.sin((lats2 - lats1) * 0.5) ** 2 + np.cos(lats1) * cos_lats2 * np.sin((lons2 - lons1) * 0.5) ** 2
+        out[start:start + MATRIX_TILE_ROWS] = 2.0 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a))
+    
+    return out
+
+
+def warm_up():
+    """
+    Compile every kernel for the float64 signatures the worker uses. With
+    cache=True the machine code lands in __pycache__, so running this at
+    image build time spares each new process the first-call JIT. Numba
+    specializes on array layout as well as dtype, so the strided column
+    views the call sites pass are compiled alongside contiguous arrays.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+    
+    coords = np.zeros((3, 2), dtype=np.float64)
+    col = np.zeros(2, dtype=np.float64)
+    haversine(0.0, 0.0, 0.0, 0.0)
+    haversine_arr(col, col, col, col)
+    # As in segment_lengths: column views of an (N, 2) array ('A' layout)
+    haversine_arr(coords[:-1, 0], coords[:-1, 1], coords[1:, 0], coords[1:, 1])
+    haversine_segments(coords)
+    total_length(coords)
+    haversine_pairwise(coords, coords)
+
+
+if __name__ == "__main__":
+    # Run as a script (python app/services/_geo_numba.py) to skip the package
+    # __init__, which needs a database
+    warm_up()
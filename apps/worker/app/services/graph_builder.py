@@ -3,8 +3,10 @@ Graph builder for street network with proper intersection detection
 """
 
 import logging
+from itertools import chain
 from typing import Dict, Any, List, Tuple, Optional
 import networkx as nx
+import shapely
 from shapely.geometry import LineString, Point, MultiLineString
 from shapely.ops import linemerge, unary_union, split, snap
 from shapely.strtree import STRtree
@@ -116,20 +118,41 @@ class GraphBuilder:
     ) -> Tuple[List[LineString], List[Dict[str, Any]]]:
         """Extract LineString geometries and their properties"""
         
+        # One pass: LineString features with at least two coordinates
+        candidates = [
+            (coords, feature.get('properties', {}))
+            for feature in features
+            if (geom := feature.get('geometry', {})).get('type') == 'LineString'
+            and len(coords := geom.get('coordinates', [])) >= 2
+        ]
+        if not candidates:
+            return [], []
+        
+        # Build and validate every line in a few GEOS array calls
+        try:
+            lengths = [len(coords) for coords, _ in candidates]
+            flat = np.asarray(list(chain.from_iterable(coords for coords, _ in candidates)), dtype=np.float64)
+            geoms = shapely.linestrings(flat, indices=np.repeat(np.arange(len(candidates)), lengths))
+            keep = shapely.is_valid(geoms) & (shapely.length(geoms) > 0)
+        except Exception:
+            # Mixed dimensions or malformed coordinates: build lines one at a time
+            return self._extract_lines_one_by_one(candidates)
+        
+        lines = geoms[keep].tolist()
+        props_list = [props for (_, props), k in zip(candidates, keep.tolist()) if k]
+        
+        return lines, props_list
+    
+    def _extract_lines_one_by_one(
+        self,
+        candidates: List[Tuple[List[List[float]], Dict[str, Any]]]
+    ) -> Tuple[List[LineString], List[Dict[str, Any]]]:
+        """Per-feature fallback for _extract_lines_and_props, skipping invalid lines"""
+        
         lines = []
         props_list = []
         
-        for feature in features:
-            geom = feature.get('geometry', {})
-            props = feature.get('properties', {})
-            
-            if geom.get('type') != 'LineString':
-                continue
-            
-            coords = geom.get('coordinates', [])
-            if len(coords) < 2:
-                continue
-            
+        for coords, props in candidates:
             try:
                 line = LineString(coords)
                 if line.is_valid and line.length > 0:
@@ -184,12 +207,9 @@ class GraphBuilder:
         to_utm = Transformer.from_crs("EPSG:4326", utm_zone, always_xy=True)
         from_utm = Transformer.from_crs(utm_zone, "EPSG:4326", always_xy=True)
         
-        # Transform to projected coordinates
-        projected_lines = []
-        for line in lines:
-            coords = list(line.coords)
-            proj_coords = [to_utm.transform(x, y) for x, y in coords]
-            projected_lines.append(LineString(proj_coords))
+        # Transform to projected coordinates, every vertex in one call
+        projected = self._transform_lines(lines, to_utm)
+        projected_lines = projected.tolist()
         
         # Snap nearby vertices to avoid hairline gaps
         snap_tolerance_m = 0.5  # 0.5 meter tolerance
@@ -197,35 +217,33 @@ class GraphBuilder:
         # Build spatial index for efficiency
         tree = STRtree(projected_lines)
         
+        # Find all potentially intersecting (line, other) pairs in one bulk query;
+        # pairs come back grouped by line, in the same order as per-line queries
+        line_idx, other_idx = tree.query(shapely.buffer(projected, snap_tolerance_m, quad_segs=16))
+        distinct = line_idx != other_idx
+        line_idx, other_idx = line_idx[distinct], other_idx[distinct]
+        
+        # Snap for cleaner intersections, then intersect all pairs in GEOS
+        snapped = shapely.snap(projected[other_idx], projected[line_idx], snap_tolerance_m)
+        hits = shapely.intersects(projected[line_idx], snapped)
+        line_idx = line_idx[hits]
+        intersections = shapely.intersection(projected[line_idx], snapped[hits])
+        
+        # Collect all intersection points per line
+        points_by_line = [[] for _ in projected_lines]
+        for i, intersection in zip(line_idx.tolist(), intersections.tolist()):
+            # Extract points from intersection
+            if isinstance(intersection, Point):
+                points_by_line[i].append(intersection)
+            elif hasattr(intersection, 'geoms'):
+                for geom in intersection.geoms:
+                    if isinstance(geom, Point):
+                        points_by_line[i].append(geom)
+        
         # Split lines at intersections
         split_segments = []
         
-        for i, line in enumerate(projected_lines):
-            # Find all potentially intersecting lines
-            candidates = tree.query(line.buffer(snap_tolerance_m))
-            
-            # Collect all intersection points
-            split_points = []
-            
-            for other_idx in candidates:
-                other = projected_lines[other_idx]
-                if other is line:
-                    continue
-                
-                # Snap for cleaner intersections
-                snapped_other = snap(other, line, snap_tolerance_m)
-                
-                if line.intersects(snapped_other):
-                    intersection = line.intersection(snapped_other)
-                    
-                    # Extract points from intersection
-                    if isinstance(intersection, Point):
-                        split_points.append(intersection)
-                    elif hasattr(intersection, 'geoms'):
-                        for geom in intersection.geoms:
-                            if isinstance(geom, Point):
-                                split_points.append(geom)
-            
+        for line, split_points in zip(projected_lines, points_by_line):
             # Split line at intersection points
             if split_points:
                 # Sort points along the line
@@ -238,15 +256,19 @@ class GraphBuilder:
             else:
                 split_segments.append(line)
         
-        # Transform back to WGS84
-        wgs84_segments = []
-        for seg in split_segments:
-            if seg.length > 0:  # Skip zero-length segments
-                coords = list(seg.coords)
-                wgs_coords = [from_utm.transform(x, y) for x, y in coords]
-                wgs84_segments.append(LineString(wgs_coords))
+        # Transform back to WGS84, skipping zero-length segments
+        kept = [seg for seg in split_segments if seg.length > 0]
+        if not kept:
+            return []
         
-        return wgs84_segments
+        return self._transform_lines(kept, from_utm).tolist()
+    
+    def _transform_lines(self, lines: List[LineString], transformer: Transformer) -> np.ndarray:
+        """Reproject LineStrings (x/y only) with one array transform over all vertices"""
+        
+        coords, index = shapely.get_coordinates(lines, return_index=True)
+        xs, ys = transformer.transform(coords[:, 0], coords[:, 1])
+        return shapely.linestrings(np.column_stack([xs, ys]), indices=index)
     
     def _split_line_at_points(
         self,
@@ -316,16 +338,22 @@ class GraphBuilder:
         
         G = nx.MultiDiGraph()
         
-        # Process each segment with quantization
-        for seg_idx, seg in enumerate(segments):
-            coords = list(seg.coords)
+        # Quantize all coordinates
+        seg_coords_list = [qlist(list(seg.coords)) for seg in segments]
+        
+        # Geodesic length of every consecutive pair of every segment in one call;
+        # pairs spanning two segments are computed too and skipped by the offsets
+        all_lengths = self._segment_lengths(list(chain.from_iterable(seg_coords_list)))
+        offset = 0
+        
+        # Process each segment
+        for seg_idx, coords in enumerate(seg_coords_list):
+            seg_lengths = all_lengths[offset:offset + len(coords) - 1]
+            offset += len(coords)
             
             if len(coords) < 2:
                 continue
             
-            # Quantize all coordinates
-            coords = qlist(coords)
-            
             # Get properties for this segment
             props = props_list[seg_idx % len(props_list)] if props_list else {}
             
@@ -336,10 +364,20 @@ class GraphBuilder:
             osm_id = props.get('osm_id', '')
             maxspeed = props.get('maxspeed', '')
             
-            # Add edges for each consecutive pair of points (intersection handling)
+            # Shared attributes for every edge of this segment, applied once per batch
+            base = {'highway': highway, 'name': name, 'osm_id': osm_id, 'maxspeed': maxspeed}
+            
+            # Determine speed for time estimation
+            speed_mps = self._get_speed_mps(highway, maxspeed)
+            
+            # Node tuples built once per point; coords are already quantized
+            nodes = [(c[0], c[1]) for c in coords]
+            
+            # Collect edges for each consecutive pair of points (intersection handling)
+            edges = []
             for i in range(len(coords) - 1):
-                u = q(tuple(coords[i]))
-                v = q(tuple(coords[i + 1]))
+                u = nodes[i]
+                v = nodes[i + 1]
                 
                 if u == v:  # Skip zero-length segments
                     continue
@@ -347,31 +385,26 @@ class GraphBuilder:
                 # Create segment geometry
                 seg_coords = [coords[i], coords[i + 1]]
                 
-                # Calculate accurate geodesic length
-                length_m = self._geodesic_length(seg_coords)
-                
-                # Determine speed for time estimation
-                speed_mps = self._get_speed_mps(highway, maxspeed)
+                # Accurate geodesic length
+                length_m = seg_lengths[i]
+                time_s = length_m / speed_mps
                 
-                # Create edge data with aligned geometry
-                edge_data = {
+                # Forward edge with aligned geometry
+                edges.append((u, v, {
                     'length': length_m,
-                    'time': length_m / speed_mps,
-                    'geometry': align_geometry(u, v, seg_coords),
-                    'highway': highway,
-                    'name': name,
-                    'osm_id': osm_id,
-                    'maxspeed': maxspeed
-                }
-                
-                # Add forward edge
-                G.add_edge(u, v, **edge_data)
+                    'time': time_s,
+                    'geometry': align_geometry(u, v, seg_coords)
+                }))
                 
-                # Add reverse edge if not one-way
+                # Reverse edge if not one-way
                 if not oneway:
-                    reverse_data = edge_data.copy()
-                    reverse_data['geometry'] = align_geometry(v, u, list(reversed(seg_coords)))
-                    G.add_edge(v, u, **reverse_data)
+                    edges.append((v, u, {
+                        'length': length_m,
+                        'time': time_s,
+                        'geometry': align_geometry(v, u, list(reversed(seg_coords)))
+                    }))
+            
+            G.add_edges_from(edges, **base)
         
         return G
     
@@ -381,17 +414,20 @@ class GraphBuilder:
         if len(coords) < 2:
             return 0.0
         
-        total_length = 0.0
+        # Summed inside pyproj in one call, no per-segment array
+        arr = np.asarray(coords, dtype=np.float64)
+        return float(GEOD.line_length(arr[:, 0], arr[:, 1]))
+    
+    def _segment_lengths(self, coords: List[Tuple[float, float]]) -> List[float]:
+        """Geodesic length in meters of each consecutive pair, via one array GEOD.inv call"""
         
-        for i in range(len(coords) - 1):
-            lon1, lat1 = coords[i]
-            lon2, lat2 = coords[i + 1]
-            
-            # Calculate geodesic distance
-            _, _, distance = GEOD.inv(lon1, lat1, lon2, lat2)
-            total_length += distance
+        if len(coords) < 2:
+            return []
+        
+        arr = np.asarray(coords, dtype=np.float64)
+        _, _, distances = GEOD.inv(arr[:-1, 0], arr[:-1, 1], arr[1:, 0], arr[1:, 1])
         
-        return total_length
+        return distances.tolist()
     
     def _get_speed_mps(self, highway: str, maxspeed: str) -> float:
         """Get estimated speed in meters per second"""
@@ -0,0 +1,105 @@
+"""
+Coalesces concurrent job submissions into batched processor calls
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH = 32  # jobs handed to the processor in one call
+MAX_WAIT_MS = 10  # how long the first job waits for company
+MAX_CONCURRENT_BATCHES = 4  # batches processed at once; the consumer keeps dequeuing meanwhile
+
+
+class JobBatcher:
+    """
+    DataLoader-style batcher: submit() queues a job and returns a future,
+    a single consumer drains up to max_batch queued jobs (waiting at most
+    max_wait_ms after the first) and runs them with one process_jobs call.
+    Batches run as tasks, up to max_concurrent_batches at once, so a long
+    job does not hold up jobs submitted after it. Each future gets its own
+    job's outcome, so one failure does not fail the rest of the batch.
+    """
+    
+    def __init__(
+        self,
+        process_jobs: Callable[[List[Dict[str, Any]]], Awaitable[List[Optional[BaseException]]]],
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = MAX_WAIT_MS,
+        max_concurrent_batches: int = MAX_CONCURRENT_BATCHES
+    ):
+        self.process_jobs = process_jobs
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._batch_slots = asyncio.Semaphore(max_concurrent_batches)
+        self._batch_tasks: Set[asyncio.Task] = set()
+    
+    async def submit(self, job: Dict[str, Any]) -> asyncio.Future:
+        """Queue a job; the returned future resolves once it has been processed"""
+        
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((job, fut))
+        return fut
+    
+    async def _next_batch(self) -> List[Tuple[Dict[str, Any], asyncio.Future]]:
+        """Block for one job, then gather more until max_batch or max_wait"""
+        
+        batch = [await self._queue.get()]
+        deadline = asyncio.get_running_loop().time() + self.max_wait
+        
+        while len(batch) < self.max_batch:
+            timeout = deadline - asyncio.get_running_loop().time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        
+        return batch
+    
+    async def run(self):
+        """Consumer loop; run as a background task and cancel to stop (in-flight batches are cancelled too)"""
+        
+        try:
+            while True:
+                batch = await self._next_batch()
+                # Submitters that gave up (cancelled requests) are dropped
+                batch = [(job, fut) for job, fut in batch if not fut.done()]
+                if not batch:
+                    continue
+                
+                await self._batch_slots.acquire()
+                task = asyncio.create_task(self._process_batch(batch))
+                self._batch_tasks.add(task)
+                task.add_done_callback(self._batch_tasks.discard)
+        finally:
+            for task in self._batch_tasks:
+                task.cancel()
+    
+    async def _process_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Run one batch and resolve each submitter's future, then free its slot"""
+        
+        try:
+            logger.info(f"Processing batch of {len(batch)} job(s)")
+            try:
+                results = await self.process_jobs([job for job, _ in batch])
+            except Exception as e:
+                results = [e] * len(batch)
+            
+            for (_, fut), error in zip(batch, results):
+                if fut.done():
+                    continue
+                if error is None:
+                    fut.set_result(None)
+                else:
+                    fut.set_exception(error)
+        finally:
+            # Cancelled mid-batch (shutdown): don't leave submitters waiting
+            for _, fut in batch:
+                if not fut.done():
+                    fut.cancel()
+            self._batch_slots.release()
@@ -4,9 +4,10 @@ Main job processing logic
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import json
 import traceback
+from functools import partial
 
 from app.database import db
 from app.config import settings
@@ -33,27 +34,43 @@ class JobProcessor:
         self.running = True
         logger.info("Job processor started")
         
+        # Re-poll quickly while work keeps arriving, back off towards poll_interval when idle
+        idle = settings.poll_min_interval
         while self.running:
             try:
-                # Check for pending jobs
-                job = db.get_pending_job()
+                # Claim a batch of pending jobs in one query
+                jobs = await self._db(db.get_pending_jobs, settings.job_batch_size)
                 
-                if job:
-                    await self.process_job(job)
+                if jobs:
+                    await self.process_jobs(jobs)
+                    idle = settings.poll_min_interval
                 else:
                     # No jobs, wait before checking again
-                    logger.debug(f"No pending jobs, waiting {settings.poll_interval}s")
-                    await asyncio.sleep(settings.poll_interval)
+                    logger.debug(f"No pending jobs, waiting {idle}s")
+                    await asyncio.sleep(idle)
+                    idle = min(idle * 2, settings.poll_interval)
             
             except Exception as e:
                 logger.error(f"Error in job processing loop: {e}")
                 await asyncio.sleep(10)  # Brief pause before retrying
     
+    async def _db(self, fn, *args, **kwargs):
+        """Run a blocking database call in the default executor, off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, partial(fn, *args, **kwargs))
+    
     async def stop(self):
         """Stop the job processor"""
         self.running = False
         logger.info("Job processor stopped")
     
+    async def process_jobs(self, jobs: List[Dict[str, Any]]) -> List[Optional[BaseException]]:
+        """Process a batch of jobs concurrently; returns each job's exception or None"""
+        results = await asyncio.gather(
+            *(self.process_job(job) for job in jobs),
+            return_exceptions=True
+        )
+        return [r if isinstance(r, BaseException) else None for r in results]
+    
     async def process_job(self, job: Dict[str, Any]):
         """Process a single job"""
         job_id = job['id']
@@ -67,19 +84,19 @@ class JobProcessor:
         
         try:
             # Update progress: Starting
-            db.update_job_status(job_id, 'processing', 10, metadata={
+            await self._db(db.update_job_status, job_id, 'processing', 10, metadata={
                 'stage': 'Fetching area data'
             })
             
             # 1. Fetch area data
-            area = db.get_area_data(area_id)
+            area = await self._db(db.get_area_data, area_id)
             if not area:
                 raise ValueError(f"Area {area_id} not found")
             
             logger.info(f"Processing area: {area['name']}")
             
             # Update progress: Fetching streets
-            db.update_job_status(job_id, 'processing', 20, metadata={
+            await self._db(db.update_job_status, job_id, 'processing', 20, metadata={
                 'stage': 'Fetching street network from OpenStreetMap'
             })
             
@@ -95,7 +112,7 @@ class JobProcessor:
             logger.info(f"Fetched {len(streets['features'])} street segments")
             
             # Update progress: Calculating route
-            db.update_job_status(job_id, 'processing', 50, metadata={
+            await self._db(db.update_job_status, job_id, 'processing', 50, metadata={
                 'stage': 'Calculating optimal coverage route'
             })
             
@@ -115,13 +132,13 @@ class JobProcessor:
             logger.info(f"Calculated route: {route_result['length_m']}m, {route_result['drive_time_s']}s")
             
             # Update progress: Generating chunks
-            db.update_job_status(job_id, 'processing', 80, metadata={
+            await self._db(db.update_job_status, job_id, 'processing', 80, metadata={
                 'stage': 'Splitting route into chunks'
             })
             
             # 4. Split into chunks
             chunk_duration = params.get('chunkDuration', 3600)
-            route_coords = route_result['geometry']['coordinates']
+            route_coords = route_result.get('_coords', route_result['geometry']['coordinates'])
             chunks = self.route_calculator.split_into_chunks(
                 route_coords,
                 chunk_duration,
@@ -131,13 +148,14 @@ class JobProcessor:
             logger.info(f"Generated {len(chunks)} chunks")
             
             # Update progress: Saving results with diagnostics
-            db.update_job_status(job_id, 'processing', 90, metadata={
+            await self._db(db.update_job_status, job_id, 'processing', 90, metadata={
                 'stage': 'Saving route to database',
                 'diagnostics': diagnostics
             })
             
             # 5. Save results
-            db.save_route_result(
+            await self._db(
+                db.save_route_result,
                 job_id,
                 json.dumps(route_result['geometry']),
                 route_result['length_m'],
@@ -151,7 +169,7 @@ class JobProcessor:
             # Mark as completed with full diagnostics
             total_time = asyncio.get_event_loop().time() - start_time
             logger.info(f"⏳ Marking job as {final_status} (100%)")
-            db.update_job_status(job_id, final_status, 100, metadata={
+            await self._db(db.update_job_status, job_id, final_status, 100, metadata={
                 'stage': 'Route generation complete',
                 'valid': is_valid,
                 'stats': {
@@ -182,7 +200,8 @@ class JobProcessor:
             logger.error(traceback.format_exc())
             
             # Mark as failed
-            db.update_job_status(
+            await self._db(
+                db.update_job_status,
                 job_id,
                 'failed',
                 0,
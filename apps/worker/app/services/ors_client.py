@@ -8,6 +8,8 @@ import json
 import time
 import random
 import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
 from typing import Dict, Any, Tuple, Optional, List
 import httpx
 from httpx import Response
@@ -17,11 +19,38 @@ from app.config import settings
 
 logger = logging.getLogger(__name__)
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+    logger.info("h2 not available - ORS requests will use HTTP/1.1")
+
+# Connection pool shared by all requests from one client
+ORS_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# ORS routes memoized in-process per client (LRU). This is the only in-process
+# route memo: the client is app-scoped, so it outlives each route request
+ROUTE_MEMO_SIZE = 10_000
+
+
+@dataclass(slots=True)
+class ORSProbeResult:
+    """Outcome of one routing call, including whether ORS or the straight-line fallback answered"""
+    coords: List[List[float]]
+    distance: float
+    used_ors: bool
+    last_error: Optional[str] = None
+    
+    @property
+    def used_fallback(self) -> bool:
+        return not self.used_ors
+
 
 class ORSClient:
     """Client for OpenRouteService API with caching and retry logic"""
     
-    def __init__(self, cache=None):
+    def __init__(self, cache=None, pool_limits: httpx.Limits = ORS_POOL_LIMITS):
         self.api_key = settings.ors_api_key
         self.directions_url = settings.ors_directions_url
         self.matrix_url = settings.ors_matrix_url
@@ -29,6 +58,12 @@ class ORSClient:
         self.max_retries = settings.ors_max_retries
         self.retry_delay = settings.ors_retry_delay
         self.cache = cache  # Redis cache instance
+        self._client: Optional[httpx.AsyncClient] = None  # Created on first request
+        self.pool_limits = pool_limits
+        self.matrix_available = True  # Cleared if the deployment has no /matrix endpoint
+        self.last_success = False  # Whether the last route call was answered by ORS
+        self.last_error: Optional[str] = None
+        self._route_memo: OrderedDict = OrderedDict()  # cache key -> Future or ORSProbeResult
         self.enabled = bool(self.api_key)  # ORS is only enabled if we have an API key
         
         # Log ORS status for debugging
@@ -48,6 +83,30 @@ class ORSClient:
         key_str = f"{loc_str}|{profile}"
         return f"ors:matrix:{hashlib.sha1(key_str.encode()).hexdigest()}"
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Long-lived pooled HTTP client, so requests reuse connections (and multiplex over HTTP/2)"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.pool_limits,
+                http2=HTTP2_AVAILABLE
+            )
+        return self._client
+    
+    async def close(self):
+        """Close the pooled HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def __aenter__(self) -> "ORSClient":
+        """Scope the pooled HTTP client to an async with block"""
+        self._get_client()
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.close()
+    
     async def _make_request_with_retry(
         self,
         method: str,
@@ -57,43 +116,44 @@ class ORSClient:
     ) -> Response:
         """Make HTTP request with exponential backoff retry"""
         
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            for attempt in range(self.max_retries):
-                try:
-                    response = await client.request(
-                        method=method,
-                        url=url,
-                        headers=headers,
-                        json=json_data
-                    )
-                    
-                    # Handle rate limiting
-                    if response.status_code == 429:
-                        retry_after = response.headers.get('Retry-After', str(self.retry_delay * (2 ** attempt)))
-                        wait_time = float(retry_after)
-                        logger.warning(f"Rate limited, waiting {wait_time}s before retry")
-                        await asyncio.sleep(wait_time)
-                        continue
-                    
-                    # Success or non-retryable error
-                    if response.status_code < 500:
-                        response.raise_for_status()
-                        return response
-                    
-                    # Server error - retry with backoff
-                    logger.warning(f"Server error {response.status_code}, attempt {attempt + 1}/{self.max_retries}")
-                    
-                except httpx.TimeoutException:
-                    logger.warning(f"Request timeout, attempt {attempt + 1}/{self.max_retries}")
-                except httpx.NetworkError as e:
-                    logger.warning(f"Network error: {e}, attempt {attempt + 1}/{self.max_retries}")
+        client = self._get_client()
+        
+        for attempt in range(self.max_retries):
+            try:
+                response = await client.request(
+                    method=method,
+                    url=url,
+                    headers=headers,
+                    json=json_data
+                )
                 
-                # Exponential backoff with jitter
-                if attempt < self.max_retries - 1:
-                    wait_time = self.retry_delay * (2 ** attempt) + (random.random() * 0.1)
+                # Handle rate limiting
+                if response.status_code == 429:
+                    retry_after = response.headers.get('Retry-After', str(self.retry_delay * (2 ** attempt)))
+                    wait_time = float(retry_after)
+                    logger.warning(f"Rate limited, waiting {wait_time}s before retry")
                     await asyncio.sleep(wait_time)
+                    continue
+                
+                # Success or non-retryable error
+                if response.status_code < 500:
+                    response.raise_for_status()
+                    return response
+                
+                # Server error - retry with backoff
+                logger.warning(f"Server error {response.status_code}, attempt {attempt + 1}/{self.max_retries}")
+                
+            except httpx.TimeoutException:
+                logger.warning(f"Request timeout, attempt {attempt + 1}/{self.max_retries}")
+            except httpx.NetworkError as e:
+                logger.warning(f"Network error: {e}, attempt {attempt + 1}/{self.max_retries}")
             
-            raise Exception(f"Failed after {self.max_retries} attempts")
+            # Exponential backoff with jitter
+            if attempt < self.max_retries - 1:
+                wait_time = self.retry_delay * (2 ** attempt) + (random.random() * 0.1)
+                await asyncio.sleep(wait_time)
+        
+        raise Exception(f"Failed after {self.max_retries} attempts")
     
     async def get_route(
         self,
@@ -115,10 +175,70 @@ class ORSClient:
             (coordinates, distance_meters) tuple
         """
         
+        if waypoints or not self.enabled:
+            result = await self.probe_route(start, end, profile, waypoints)
+        else:
+            result = await self._memoized_route(start, end, profile)
+        return list(result.coords), result.distance
+    
+    async def _memoized_route(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        profile: str
+    ) -> ORSProbeResult:
+        """
+        probe_route run once per rounded (start, end, profile), LRU-bounded to
+        ROUTE_MEMO_SIZE. Concurrent duplicates await the same future; fallback
+        results are shared with them but not retained, so a transient ORS
+        failure doesn't stick.
+        """
+        
+        key = self._cache_key(start, end, profile)
+        memo = self._route_memo
+        entry = memo.get(key)
+        if entry is None:
+            entry = asyncio.ensure_future(self.probe_route(start, end, profile))
+            memo[key] = entry
+            while len(memo) > ROUTE_MEMO_SIZE:
+                memo.popitem(last=False)
+        else:
+            memo.move_to_end(key)
+        
+        if not isinstance(entry, asyncio.Future):
+            return entry
+        
+        # Shield so one cancelled caller doesn't cancel a request others share
+        try:
+            result = await asyncio.shield(entry)
+        except Exception:
+            if memo.get(key) is entry:
+                del memo[key]
+            raise
+        
+        if memo.get(key) is entry:
+            if result.used_ors:
+                memo[key] = result
+            else:
+                del memo[key]
+        return result
+    
+    async def probe_route(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        profile: str = "driving-car",
+        waypoints: Optional[List[Tuple[float, float]]] = None
+    ) -> ORSProbeResult:
+        """get_route, also reporting whether ORS answered and why it didn't"""
+        
         # If ORS is not enabled, return straight line
         if not self.enabled:
             logger.warning(f"ORS not enabled (key present: {bool(self.api_key)}, length: {len(self.api_key) if self.api_key else 0}), returning straight line")
-            return [list(start), list(end)], self._haversine(start, end)
+            return ORSProbeResult(
+                [list(start), list(end)], self._haversine(start, end),
+                used_ors=False, last_error="ORS not enabled"
+            )
         
         # Check cache first
         if self.cache and not waypoints:
@@ -126,7 +246,7 @@ class ORSClient:
             cached = await self._get_cached(cache_key)
             if cached:
                 logger.debug(f"Cache hit for route {start} -> {end}")
-                return cached['coordinates'], cached['distance']
+                return ORSProbeResult(cached['coordinates'], cached['distance'], used_ors=True)
         
         # Build coordinates list
         coords = [list(start)]
@@ -192,7 +312,7 @@ class ORSClient:
             
             # Return the actual ORS distance (not haversine)
             # The coordinates may be simplified but distance is accurate
-            return coordinates, distance
+            return ORSProbeResult(coordinates, distance, used_ors=True)
             
         except Exception as e:
             error_msg = f"Failed to get route from {start} to {end}: {e}"
@@ -201,7 +321,10 @@ class ORSClient:
             self.last_error = str(e)
             self.last_success = False
             # Return straight line as fallback (will be flagged in validation)
-            return [list(start), list(end)], self._haversine(start, end)
+            return ORSProbeResult(
+                [list(start), list(end)], self._haversine(start, end),
+                used_ors=False, last_error=self.last_error
+            )
     
     async def get_distance_matrix(
         self,
@@ -281,6 +404,92 @@ class ORSClient:
                         matrix[i][j] = self._haversine(locations[i], locations[j])
             return matrix
     
+    async def get_matrix(
+        self,
+        sources: List[Tuple[float, float]],
+        destinations: List[Tuple[float, float]],
+        profile: str = "driving-car"
+    ) -> List[List[Optional[float]]]:
+        """
+        Get distance matrix from sources to destinations in a single call
+        
+        Args:
+            sources: List of (lon, lat) origin tuples
+            destinations: List of (lon, lat) destination tuples
+            profile: routing profile
+        
+        Returns:
+            len(sources) x len(destinations) matrix of distances in meters
+            (None where ORS found no route)
+        """
+        
+        def haversine_matrix():
+            return [[self._haversine(src, dst) for dst in destinations] for src in sources]
+        
+        # If ORS is not enabled, return haversine distances
+        if not self.enabled or not self.matrix_available:
+            logger.debug("ORS matrix not available, using haversine distances")
+            return haversine_matrix()
+        
+        locations = [[loc[0], loc[1]] for loc in sources] + [[loc[0], loc[1]] for loc in destinations]
+        source_idx = list(range(len(sources)))
+        destination_idx = list(range(len(sources), len(locations)))
+        
+        # Check cache (source count disambiguates the split of locations)
+        if self.cache:
+            cache_key = self._matrix_cache_key(locations + [[len(sources)]], profile)
+            cached = await self._get_cached(cache_key)
+            if cached:
+                logger.debug(f"Cache hit for {len(sources)}x{len(destinations)} matrix")
+                return cached
+        
+        # Prepare request
+        headers = {
+            "Authorization": self.api_key,
+            "Content-Type": "application/json",
+            "Accept": "application/json"
+        }
+        
+        json_data = {
+            "locations": locations,
+            "sources": source_idx,
+            "destinations": destination_idx,
+            "metrics": ["distance"],
+            "units": "m"
+        }
+        
+        # Make request
+        try:
+            response = await self._make_request_with_retry(
+                method="POST",
+                url=self.matrix_url.replace("driving-car", profile),
+                headers=headers,
+                json_data=json_data
+            )
+            
+            data = response.json()
+            distances = data['distances']
+            
+            # Cache result
+            if self.cache:
+                await self._set_cached(cache_key, distances, ttl=86400)
+            
+            return distances
+            
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in (404, 405, 501):
+                # Endpoint missing on this deployment - stop asking for the process lifetime
+                logger.warning(f"ORS matrix endpoint unavailable ({e.response.status_code}), using per-route probes")
+                self.matrix_available = False
+            else:
+                logger.error(f"Failed to get {len(sources)}x{len(destinations)} distance matrix: {e}")
+            return haversine_matrix()
+            
+        except Exception as e:
+            logger.error(f"Failed to get {len(sources)}x{len(destinations)} distance matrix: {e}")
+            # Return haversine distances as fallback
+            return haversine_matrix()
+    
     async def route_between_points(
         self,
         start: List[float],
@@ -2,31 +2,56 @@
 Route calculation using proper Chinese Postman algorithm with directed graphs
 """
 
+import asyncio
 import logging
+from concurrent.futures import Executor
 from typing import Dict, Any, List, Optional, Tuple, Set
 import networkx as nx
-from pyproj import Geod
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
 
 from app.config import settings
+from app.services._coord_buffer import CoordBuffer
+from app.services._geo_numba import geodesic_length, haversine, haversine_matrix, segment_lengths
 from app.services.graph_builder import GraphBuilder
-from app.services.route_connector import RouteConnector
+from app.services.route_connector import RouteConnector, node_components
 from app.services.ors_client import ORSClient
 
 logger = logging.getLogger(__name__)
 
-# Geodesic calculator
-GEOD = Geod(ellps="WGS84")
+# SCCs processed concurrently by default
+SCC_CONCURRENCY = 8
+
+# Average speed (m/s) per routing profile for time estimates
+SPEED_BY_PROFILE = {
+    'driving-car': 10.0,      # 36 km/h average city
+    'driving-hgv': 8.0,       # 29 km/h for trucks
+    'cycling-regular': 4.0,   # 14 km/h
+    'foot-walking': 1.4,      # 5 km/h
+}
+DEFAULT_SPEED_MPS = SPEED_BY_PROFILE['driving-car']
 
 
 class RouteCalculator:
     """Calculates optimal coverage routes using proper CPP with directed graphs"""
     
-    def __init__(self, ors_client: ORSClient = None, cache=None, coverage_mode: bool = True):
+    def __init__(
+        self,
+        ors_client: ORSClient = None,
+        cache=None,
+        coverage_mode: bool = True,
+        concurrency: int = SCC_CONCURRENCY,
+        executor: Optional[Executor] = None
+    ):
         self.graph_builder = GraphBuilder()
         self.ors_client = ors_client or ORSClient(cache=cache)
         self.route_connector = RouteConnector(self.ors_client, coverage_mode=coverage_mode)
         self.max_gap = settings.max_gap_meters
         self.coverage_mode = coverage_mode
+        self.concurrency = concurrency
+        self.executor = executor  # Runs SCC Eulerization; None uses the loop's default thread pool
     
     async def calculate_route(
         self,
@@ -66,58 +91,22 @@ class RouteCalculator:
             
             # Step 2: Find strongly connected components (SCCs)
             logger.info("Finding strongly connected components...")
-            sccs = list(nx.strongly_connected_components(G))
+            sccs = node_components(G, connection='strong')
             diagnostics['scc_count'] = len(sccs)
             logger.info(f"Found {len(sccs)} strongly connected components")
             
-            # Process each SCC independently
-            scc_circuits = []
-            scc_stats = []
+            # Process each SCC independently; connecting parts may await routing,
+            # so SCCs run concurrently (bounded) and results keep SCC order
+            slots = asyncio.Semaphore(self.concurrency)
             
-            for idx, scc_nodes in enumerate(sccs):
-                # Skip empty components
-                if not scc_nodes:
-                    continue
-                
-                # Get subgraph for this SCC
-                G_scc = G.subgraph(scc_nodes).copy()
-                
-                if G_scc.number_of_edges() == 0:
-                    logger.info(f"SCC {idx}: No edges, skipping")
-                    continue
-                
-                logger.info(f"SCC {idx}: {G_scc.number_of_nodes()} nodes, {G_scc.number_of_edges()} edges")
-                
-                # Step 3: Connect weakly disconnected parts within SCC if needed
-                if not nx.is_weakly_connected(G_scc):
-                    logger.info(f"SCC {idx}: Connecting weakly disconnected parts...")
-                    G_scc = await self.route_connector.connect_components(G_scc)
-                
-                # Step 4: Make SCC Eulerian using directed min-cost flow
-                logger.info(f"SCC {idx}: Making directed Eulerian via min-cost flow...")
-                G_eulerian, euler_stats = await self._make_eulerian_directed(G_scc)
-                
-                scc_stats.append({
-                    'scc_idx': idx,
-                    'nodes': G_scc.number_of_nodes(),
-                    'edges': G_scc.number_of_edges(),
-                    **euler_stats
-                })
-                
-                # Step 5: Validate directed Eulerian property
-                if not self._validate_eulerian_directed(G_eulerian):
-                    logger.warning(f"SCC {idx}: Not perfectly Eulerian, but continuing")
-                
-                # Step 6: Find Eulerian circuit for this SCC (with keys for MultiDiGraph)
-                try:
-                    circuit = list(nx.eulerian_circuit(G_eulerian, keys=True))
-                    logger.info(f"SCC {idx}: Found Eulerian circuit with {len(circuit)} edges")
-                    scc_circuits.append((idx, G_eulerian, circuit))
-                except nx.NetworkXError as e:
-                    logger.error(f"SCC {idx}: Failed to find Eulerian circuit: {e}")
-                    # Use all edges as fallback (with keys)
-                    circuit = list(G_eulerian.edges(keys=True))
-                    scc_circuits.append((idx, G_eulerian, circuit))
+            async def process(idx: int, scc_nodes: Set) -> Optional[Tuple[Dict[str, Any], tuple]]:
+                async with slots:
+                    return await self._process_scc(G, idx, scc_nodes)
+            
+            results = await asyncio.gather(*(process(idx, scc) for idx, scc in enumerate(sccs)))
+            results = [r for r in results if r is not None]
+            scc_stats = [stats for stats, _ in results]
+            scc_circuits = [circuit for _, circuit in results]
             
             diagnostics['scc_stats'] = scc_stats
             diagnostics['circuits_found'] = len(scc_circuits)
@@ -150,16 +139,17 @@ class RouteCalculator:
             
             # Step 8: Stitch SCC circuits together with routing
             logger.info("Stitching SCC circuits with routing...")
-            route_coords = await self._stitch_scc_circuits(
+            route_coords, route_length = await self._stitch_scc_circuits(
                 scc_circuits, 
                 ordered_indices, 
                 profile
             )
             
-            if not route_coords:
+            if not len(route_coords):
                 logger.warning("Failed to assemble route via circuits - attempting edge concatenation fallback")
                 # Fallback: concatenate all edges from all SCCs
                 route_coords = []
+                route_length = None
                 for idx, G_scc, circuit in scc_circuits:
                     for edge in circuit:
                         if len(edge) == 3:  # Has edge key
@@ -177,10 +167,12 @@ class RouteCalculator:
                 if not route_coords:
                     raise ValueError("Failed to assemble route - no geometry found")
             
-            diagnostics['route_points'] = len(route_coords)
+            # Pack coordinates into a single float64 array for all downstream passes
+            coords_arr = np.asarray(route_coords, dtype=np.float64)
+            diagnostics['route_points'] = coords_arr.shape[0]
             
             # Step 9: Validate continuity
-            is_valid, violations = self._validate_continuity(route_coords)
+            is_valid, violations = self._validate_continuity(coords_arr)
             diagnostics['continuity_valid'] = is_valid
             diagnostics['continuity_violations'] = len(violations)
             
@@ -189,15 +181,16 @@ class RouteCalculator:
                 diagnostics['max_gap_m'] = max_gap
                 logger.warning(f"Route has {len(violations)} gaps, max: {max_gap:.1f}m")
             
-            # Calculate route statistics
-            length_m, time_s = self._calculate_route_stats(route_coords, profile)
+            # Calculate route statistics (length already accumulated while stitching)
+            length_m, time_s = self._calculate_route_stats(coords_arr, profile, length_m=route_length)
             
             # Prepare result
             result = {
                 'geometry': {
                     'type': 'LineString',
-                    'coordinates': route_coords
+                    'coordinates': coords_arr.tolist()
                 },
+                '_coords': coords_arr,
                 'length_m': length_m,
                 'drive_time_s': time_s,
                 'diagnostics': diagnostics,
@@ -212,8 +205,77 @@ class RouteCalculator:
             logger.error(f"Route calculation failed: {e}", exc_info=True)
             raise
     
-    async def _make_eulerian_directed(
-        self, 
+    async def _process_scc(
+        self,
+        G: nx.MultiDiGraph,
+        idx: int,
+        scc_nodes: Set
+    ) -> Optional[Tuple[Dict[str, Any], Tuple[int, nx.MultiDiGraph, list]]]:
+        """
+        Eulerize one SCC and find its circuit
+        
+        Returns:
+            (scc stats, (idx, Eulerian graph, circuit)), or None for SCCs without edges
+        """
+        
+        # Skip empty components
+        if not scc_nodes:
+            return None
+        
+        # Read-only view of this SCC; connect_components and _balance_directed copy before mutating
+        G_scc = G.subgraph(scc_nodes)
+        
+        if G_scc.number_of_edges() == 0:
+            logger.info(f"SCC {idx}: No edges, skipping")
+            return None
+        
+        logger.info(f"SCC {idx}: {G_scc.number_of_nodes()} nodes, {G_scc.number_of_edges()} edges")
+        
+        # Step 3: Connect weakly disconnected parts within SCC if needed
+        if len(node_components(G_scc)) > 1:
+            logger.info(f"SCC {idx}: Connecting weakly disconnected parts...")
+            G_scc = await self.route_connector.connect_components(G_scc)
+        
+        # Steps 4-6 are CPU-bound; run them off the event loop so SCCs overlap
+        # (scipy releases the GIL) and the loop stays responsive
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._eulerize_scc, idx, G_scc)
+    
+    def _eulerize_scc(
+        self,
+        idx: int,
+        G_scc: nx.MultiDiGraph
+    ) -> Tuple[Dict[str, Any], Tuple[int, nx.MultiDiGraph, list]]:
+        """Balance one connected SCC, validate it and find its circuit (thread-safe)"""
+        
+        # Step 4: Make SCC Eulerian using directed min-cost flow
+        logger.info(f"SCC {idx}: Making directed Eulerian via min-cost flow...")
+        G_eulerian, euler_stats = self._balance_directed(G_scc)
+        
+        stats = {
+            'scc_idx': idx,
+            'nodes': G_scc.number_of_nodes(),
+            'edges': G_scc.number_of_edges(),
+            **euler_stats
+        }
+        
+        # Step 5: Validate directed Eulerian property
+        if not self._validate_eulerian_directed(G_eulerian):
+            logger.warning(f"SCC {idx}: Not perfectly Eulerian, but continuing")
+        
+        # Step 6: Find Eulerian circuit for this SCC (with keys for MultiDiGraph)
+        try:
+            circuit = list(nx.eulerian_circuit(G_eulerian, keys=True))
+            logger.info(f"SCC {idx}: Found Eulerian circuit with {len(circuit)} edges")
+        except nx.NetworkXError as e:
+            logger.error(f"SCC {idx}: Failed to find Eulerian circuit: {e}")
+            # Use all edges as fallback (with keys)
+            circuit = list(G_eulerian.edges(keys=True))
+        
+        return stats, (idx, G_eulerian, circuit)
+    
+    def _balance_directed(
+        self,
         G: nx.MultiDiGraph
     ) -> Tuple[nx.MultiDiGraph, Dict[str, Any]]:
         """
@@ -225,14 +287,22 @@ class RouteCalculator:
         """
         
         stats = {}
-        H = G.copy()
+        # Materialize a mutable graph (G may be a read-only subgraph view)
+        H = nx.MultiDiGraph(G)
+        
+        # Edges as parallel (u, v, length) arrays over node indexes
+        nodes = list(H.nodes())
+        node_idx = {v: i for i, v in enumerate(nodes)}
+        edge_u, edge_v, edge_len = self._edge_arrays(H, node_idx)
         
         # Calculate node balance: out-degree - in-degree
-        balance = {v: H.out_degree(v) - H.in_degree(v) for v in H.nodes()}
+        n = len(nodes)
+        balance_arr = np.bincount(edge_u, minlength=n) - np.bincount(edge_v, minlength=n)
+        balance = dict(zip(nodes, balance_arr.tolist()))
         
         # Find imbalanced nodes
-        supply_nodes = [v for v, b in balance.items() if b < 0]  # Need more out-edges
-        demand_nodes = [v for v, b in balance.items() if b > 0]  # Need more in-edges
+        supply_nodes = [nodes[i] for i in np.flatnonzero(balance_arr < 0)]  # Need more out-edges
+        demand_nodes = [nodes[i] for i in np.flatnonzero(balance_arr > 0)]  # Need more in-edges
         
         stats['imbalanced_nodes'] = len(supply_nodes) + len(demand_nodes)
         
@@ -244,29 +314,102 @@ class RouteCalculator:
         
         logger.info(f"Found {len(supply_nodes)} supply nodes, {len(demand_nodes)} demand nodes")
         
-        # Compute shortest paths from supply to demand nodes
-        dist = {}
-        paths = {}
+        # Shortest paths from every supply node in one compiled multi-source Dijkstra
+        supply_idx = [node_idx[s] for s in supply_nodes]
+        demand_idx = np.array([node_idx[d] for d in demand_nodes], dtype=np.int64)
         
-        for s in supply_nodes:
-            try:
-                # Use Dijkstra for shortest paths
-                lengths, path_dict = nx.single_source_dijkstra(H, s, weight='length')
-                dist[s] = {}
-                paths[s] = {}
-                
-                for d in demand_nodes:
-                    if d in lengths:
-                        dist[s][d] = lengths[d]
-                        paths[s][d] = path_dict[d]
-                    else:
-                        dist[s][d] = float('inf')
-                        paths[s][d] = None
-                        
-            except Exception as e:
-                logger.warning(f"Failed to compute paths from {s}: {e}")
-                dist[s] = {d: float('inf') for d in demand_nodes}
-                paths[s] = {d: None for d in demand_nodes}
+        dist_matrix, predecessors = self._multi_source_dijkstra(n, edge_u, edge_v, edge_len, supply_idx)
+        # dist[s][d] as a (|supply|, |demand|) block
+        dist_sd = dist_matrix[:, demand_idx]
+        
+        # Unit imbalances (the usual case) are a bipartite matching; solve that
+        # directly and use min-cost flow for multi-unit imbalances or if it fails
+        flow_dict = None
+        if np.abs(balance_arr).max() == 1:
+            flow_dict = self._unit_assignment(supply_nodes, demand_nodes, dist_sd)
+        if flow_dict is None:
+            flow_dict = self._min_cost_flow(supply_nodes, demand_nodes, balance, dist_sd)
+        
+        # Duplicate edges along shortest paths based on flow
+        total_duplicated_length = 0.0
+        edges_added = 0
+        
+        supply_row = {s: i for i, s in enumerate(supply_nodes)}
+        
+        for s in flow_dict:
+            for d, flow in flow_dict[s].items():
+                if flow > 0 and s in supply_row and d in node_idx:
+                    path = self._trace_path(predecessors[supply_row[s]], node_idx[s], node_idx[d], nodes)
+                    if not path:
+                        continue
+                    
+                    # Shortest parallel edge of each step, looked up once per path
+                    steps = [
+                        (u, v, min(H.get_edge_data(u, v).values(), key=lambda x: x.get('length', float('inf'))))
+                        for u, v in zip(path, path[1:])
+                        if H.has_edge(u, v)
+                    ]
+                    
+                    # Duplicate edges along this path 'flow' times, tallying stats as we go
+                    for _ in range(int(flow)):
+                        for u, v, edge_data in steps:
+                            H.add_edge(u, v, **edge_data)
+                            total_duplicated_length += edge_data.get('length', 0)
+                            edges_added += 1
+        
+        stats['duplicated_length_m'] = total_duplicated_length
+        stats['edges_added'] = edges_added
+        
+        # Calculate deadhead ratio against the edge lengths read before duplication
+        original_length = float(np.nansum(edge_len))
+        if original_length > 0:
+            stats['deadhead_ratio'] = total_duplicated_length / original_length
+        else:
+            stats['deadhead_ratio'] = 0
+        
+        logger.info(f"Added {edges_added} duplicate edges, deadhead ratio: {stats['deadhead_ratio']:.2%}")
+        
+        return H, stats
+    
+    def _unit_assignment(
+        self,
+        supply_nodes: List[Any],
+        demand_nodes: List[Any],
+        dist_sd: np.ndarray
+    ) -> Optional[Dict[Any, Dict[Any, int]]]:
+        """
+        Min-cost flow for all-unit imbalances as a linear sum assignment (Hungarian)
+        over the same integer costs. Returns None if no complete matching uses only
+        reachable pairs, so the caller can fall back to min-cost flow.
+        """
+        
+        if len(supply_nodes) != len(demand_nodes):
+            return None
+        
+        reachable = np.isfinite(dist_sd)
+        # Integer costs as in the flow network; unreachable pairs priced out
+        cost = np.where(reachable, np.floor(np.where(reachable, dist_sd, 0) * 1000), 0)
+        big = cost.max() * len(supply_nodes) + 1 if cost.size else 1
+        cost[~reachable] = big
+        
+        rows, cols = linear_sum_assignment(cost)
+        if not reachable[rows, cols].all():
+            return None
+        
+        logger.info("Unit imbalances matched by linear sum assignment")
+        flow_dict = {s: {} for s in supply_nodes}
+        for i, j in zip(rows, cols):
+            flow_dict[supply_nodes[i]][demand_nodes[j]] = 1
+        return flow_dict
+    
+    def _min_cost_flow(
+        self,
+        supply_nodes: List[Any],
+        demand_nodes: List[Any],
+        balance: Dict[Any, int],
+        dist_sd: np.ndarray
+    ) -> Dict[Any, Dict[Any, int]]:
+        """Min-cost flow from supply to demand nodes over shortest-path costs"""
         
         # Build min-cost flow network
         F = nx.DiGraph()
@@ -278,15 +421,14 @@ class RouteCalculator:
         for d in demand_nodes:
             F.add_node(d, demand=balance[d])  # Positive value
         
-        # Add edges with costs based on shortest path distances
-        for s in supply_nodes:
-            for d in demand_nodes:
-                if dist[s][d] < float('inf'):
-                    # Use integer cost (multiply by 1000 for precision)
-                    cost = int(dist[s][d] * 1000)
-                    # Capacity should be sufficient for all flow
-                    capacity = abs(balance[s]) + abs(balance[d])
-                    F.add_edge(s, d, weight=cost, capacity=capacity)
+        # Add edges with costs based on shortest path distances (reachable pairs only)
+        for i, j in zip(*np.nonzero(np.isfinite(dist_sd))):
+            s, d = supply_nodes[i], demand_nodes[j]
+            # Use integer cost (multiply by 1000 for precision)
+            cost = int(dist_sd[i, j] * 1000)
+            # Capacity should be sufficient for all flow
+            capacity = abs(balance[s]) + abs(balance[d])
+            F.add_edge(s, d, weight=cost, capacity=capacity)
         
         # Solve min-cost flow problem
         try:
@@ -300,45 +442,80 @@ class RouteCalculator:
             logger.error(f"Min-cost flow failed: {e}")
             flow_dict = self._simple_flow_fallback(supply_nodes, demand_nodes, balance)
         
-        # Duplicate edges along shortest paths based on flow
-        total_duplicated_length = 0.0
-        edges_added = 0
+        return flow_dict
+    
+    def _edge_arrays(
+        self,
+        H: nx.MultiDiGraph,
+        node_idx: Dict[Any, int]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        H's edges as parallel (u, v, length) arrays of node indexes and meters,
+        in H.edges() order; edges without a length get NaN
+        """
         
-        for s in flow_dict:
-            for d, flow in flow_dict[s].items():
-                if flow > 0 and s in paths and d in paths[s] and paths[s][d]:
-                    path = paths[s][d]
-                    
-                    # Duplicate edges along this path 'flow' times
-                    for _ in range(int(flow)):
-                        for i in range(len(path) - 1):
-                            u, v = path[i], path[i + 1]
-                            
-                            # Find the edge to duplicate
-                            if H.has_edge(u, v):
-                                # Get the shortest edge if multiple exist
-                                edge_data = min(
-                                    H.get_edge_data(u, v).values(),
-                                    key=lambda x: x.get('length', float('inf'))
-                                )
-                                # Add duplicate edge
-                                H.add_edge(u, v, **edge_data)
-                                total_duplicated_length += edge_data.get('length', 0)
-                                edges_added += 1
+        m = H.number_of_edges()
+        edge_u = np.empty(m, dtype=np.int64)
+        edge_v = np.empty(m, dtype=np.int64)
+        edge_len = np.empty(m, dtype=np.float64)
+        for i, (u, v, length) in enumerate(H.edges(data='length', default=np.nan)):
+            edge_u[i] = node_idx[u]
+            edge_v[i] = node_idx[v]
+            edge_len[i] = length
         
-        stats['duplicated_length_m'] = total_duplicated_length
-        stats['edges_added'] = edges_added
+        return edge_u, edge_v, edge_len
+    
+    def _multi_source_dijkstra(
+        self,
+        n: int,
+        rows: np.ndarray,
+        cols: np.ndarray,
+        weights: np.ndarray,
+        sources: List[int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Shortest 'length' distances from each source to every node via scipy's
+        compiled Dijkstra over a CSR adjacency matrix built from edge arrays
         
-        # Calculate deadhead ratio
-        original_length = sum(d.get('length', 0) for _, _, d in G.edges(data=True))
-        if original_length > 0:
-            stats['deadhead_ratio'] = total_duplicated_length / original_length
-        else:
-            stats['deadhead_ratio'] = 0
+        Returns:
+            (distances, predecessors), each (len(sources), n); unreachable is inf / -9999
+        """
         
-        logger.info(f"Added {edges_added} duplicate edges, deadhead ratio: {stats['deadhead_ratio']:.2%}")
+        m = rows.shape[0]
+        # Edges without a length cost 1
+        weights = np.nan_to_num(weights, nan=1.0)
         
-        return H, stats
+        # Parallel edges: keep the shortest (csr_matrix would sum duplicates).
+        # Sort by (row, col, weight) and take the first of each pair.
+        order = np.lexsort((weights, cols, rows))
+        rows, cols, weights = rows[order], cols[order], weights[order]
+        first = np.ones(m, dtype=bool)
+        first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+        rows, cols, weights = rows[first], cols[first], weights[first]
+        
+        # Explicit zeros would be dropped as "no edge"; keep zero-length edges usable
+        weights = np.maximum(weights, 1e-9)
+        
+        graph = csr_matrix((weights, (rows, cols)), shape=(n, n))
+        return dijkstra(graph, directed=True, indices=sources, return_predecessors=True)
+    
+    def _trace_path(
+        self,
+        predecessors: np.ndarray,
+        source: int,
+        target: int,
+        nodes: List[Any]
+    ) -> Optional[List[Any]]:
+        """Node path source -> target from one row of a Dijkstra predecessor matrix"""
+        
+        path = [target]
+        while path[-1] != source:
+            prev = predecessors[path[-1]]
+            if prev < 0:
+                return None
+            path.append(int(prev))
+        
+        return [nodes[i] for i in reversed(path)]
     
     def _simple_flow_fallback(
         self,
@@ -370,13 +547,20 @@ class RouteCalculator:
         Validate directed Eulerian property: in_degree == out_degree for all nodes
         """
         
-        for n in G.nodes():
-            if G.in_degree(n) != G.out_degree(n):
-                logger.warning(f"Node {n} imbalanced: in={G.in_degree(n)}, out={G.out_degree(n)}")
-                return False
+        # Degrees from the edge endpoint arrays in one bincount each
+        nodes = list(G.nodes())
+        edge_u, edge_v, _ = self._edge_arrays(G, {v: i for i, v in enumerate(nodes)})
+        out_degree = np.bincount(edge_u, minlength=len(nodes))
+        in_degree = np.bincount(edge_v, minlength=len(nodes))
+        
+        imbalanced = np.flatnonzero(in_degree != out_degree)
+        if imbalanced.size:
+            i = imbalanced[0]
+            logger.warning(f"Node {nodes[i]} imbalanced: in={in_degree[i]}, out={out_degree[i]}")
+            return False
         
         # Also check if strongly connected (ideal but not required for our approach)
-        if not nx.is_strongly_connected(G):
+        if len(node_components(G, connection='strong')) > 1:
             logger.info("Graph is balanced but not strongly connected (OK for SCC processing)")
         
         return True
@@ -396,34 +580,29 @@ class RouteCalculator:
                 centroids.append((0, 0))
                 continue
             
-            nodes = list(G.nodes())
-            avg_lon = sum(n[0] for n in nodes) / len(nodes)
-            avg_lat = sum(n[1] for n in nodes) / len(nodes)
+            # One pass over the nodes straight into a flat array, no intermediate lists
+            coords = np.fromiter(
+                (c for node in G.nodes() for c in node[:2]),
+                dtype=np.float64,
+                count=2 * G.number_of_nodes()
+            ).reshape(-1, 2)
+            avg_lon, avg_lat = coords.mean(axis=0).tolist()
             centroids.append((avg_lon, avg_lat))
         
-        # Simple nearest neighbor TSP
+        # Simple nearest neighbor TSP over one all-pairs distance matrix
         n = len(centroids)
-        unvisited = set(range(n))
+        pts = np.asarray(centroids, dtype=np.float64)
+        dist = haversine_matrix(pts, pts)
+        visited = np.zeros(n, dtype=bool)
         order = [0]  # Start with first SCC
-        unvisited.remove(0)
+        visited[0] = True
         
-        while unvisited:
-            last_idx = order[-1]
-            last_centroid = centroids[last_idx]
-            
-            # Find nearest unvisited
-            best_idx = None
-            best_dist = float('inf')
-            
-            for idx in unvisited:
-                dist = self._haversine(last_centroid, centroids[idx])
-                if dist < best_dist:
-                    best_dist = dist
-                    best_idx = idx
-            
-            if best_idx is not None:
-                order.append(best_idx)
-                unvisited.remove(best_idx)
+        for _ in range(n - 1):
+            # Find nearest unvisited (lowest index on ties)
+            row = np.where(visited, np.inf, dist[order[-1]])
+            best_idx = int(np.argmin(row))
+            order.append(best_idx)
+            visited[best_idx] = True
         
         return order
     
@@ -432,12 +611,18 @@ class RouteCalculator:
         scc_circuits: List[Tuple[int, nx.MultiDiGraph, List[Tuple]]],
         order: List[int],
         profile: str
-    ) -> List[List[float]]:
+    ) -> Tuple[np.ndarray, float]:
         """
         Stitch SCC circuits together with routing connections
+        
+        Returns:
+            ((N, 2) route coordinates, route length in meters)
         """
         
-        route_coords = []
+        # Packed buffer instead of a list of [lon, lat] lists; the calculator
+        # works on the array directly
+        route = CoordBuffer()
+        route_length = 0.0
         
         for seq_idx, scc_idx in enumerate(order):
             # Find the SCC data
@@ -453,7 +638,7 @@ class RouteCalculator:
             G_scc, circuit = scc_data
             
             # Assemble coordinates for this circuit (with edge keys)
-            circuit_coords = await self.route_connector.bridge_route_gaps(
+            circuit_coords, circuit_length = await self.route_connector.bridge_route_gaps(
                 G_scc, circuit, use_edge_keys=True
             )
             
@@ -464,11 +649,12 @@ class RouteCalculator:
             logger.info(f"SCC {scc_idx}: Generated {len(circuit_coords)} coordinates")
             
             # If this is the first SCC, just add its coordinates
-            if not route_coords:
-                route_coords = circuit_coords
+            if not len(route):
+                route.extend(circuit_coords)
+                route_length = circuit_length
             else:
                 # Connect to previous SCC using ORS
-                last_point = route_coords[-1]
+                last_point = route.last()
                 first_point = circuit_coords[0]
                 
                 # Get connecting route
@@ -477,54 +663,51 @@ class RouteCalculator:
                 if gap_distance > self.max_gap:
                     logger.info(f"Connecting SCCs with {gap_distance:.0f}m gap")
                     
-                    # Use the new route_between_points method
-                    if hasattr(self.ors_client, 'route_between_points'):
-                        connector = await self.ors_client.route_between_points(
-                            last_point,
-                            first_point,
-                            profile=profile
-                        )
-                    else:
-                        # Fallback to get_route
-                        connector, _ = await self.ors_client.get_route(
-                            tuple(last_point),
-                            tuple(first_point),
-                            profile=profile
-                        )
+                    # Through the connector's ORS memo, shared with gap bridging
+                    # and kept across jobs
+                    connector = await self.route_connector.route_between_points(
+                        last_point,
+                        first_point,
+                        profile=profile
+                    )
                     
                     # Add connector (skip first point to avoid duplicate)
                     if connector and len(connector) > 1:
-                        route_coords.extend(connector[1:])
+                        route_length += geodesic_length(
+                            np.asarray([last_point] + connector[1:], dtype=np.float64)
+                        )
+                        route.extend(connector[1:])
                 
                 # Add circuit coordinates (skip first if it's duplicate)
-                if route_coords[-1] == circuit_coords[0]:
-                    route_coords.extend(circuit_coords[1:])
+                last_point = route.last()
+                if last_point == list(circuit_coords[0]):
+                    route.extend(circuit_coords[1:])
                 else:
-                    route_coords.extend(circuit_coords)
+                    route_length += geodesic_length(
+                        np.asarray([last_point, circuit_coords[0]], dtype=np.float64)
+                    )
+                    route.extend(circuit_coords)
+                route_length += circuit_length
         
-        return route_coords
+        return route.array(), route_length
     
     def _validate_continuity(
         self,
-        coords: List[List[float]]
+        coords: np.ndarray
     ) -> Tuple[bool, List[Tuple[int, float]]]:
         """
         Validate route continuity
         
+        Args:
+            coords: (N, 2) route coordinates
+        
         Returns:
             (is_valid, list of (index, gap_distance) for violations)
         """
         
-        violations = []
-        
-        for i in range(len(coords) - 1):
-            p1 = tuple(coords[i])
-            p2 = tuple(coords[i + 1])
-            
-            distance = self._haversine(p1, p2)
-            
-            if distance > self.max_gap:
-                violations.append((i, distance))
+        distances = segment_lengths(coords)
+        violation_idx = np.nonzero(distances > self.max_gap)[0]
+        violations = [(int(i), float(distances[i])) for i in violation_idx]
         
         is_valid = len(violations) == 0
         
@@ -537,52 +720,47 @@ class RouteCalculator:
         return is_valid, violations
     
     def _haversine(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        """Calculate haversine distance in meters"""
-        
-        lon1, lat1 = p1
-        lon2, lat2 = p2
-        
-        # Use pyproj for accurate calculation
-        _, _, distance = GEOD.inv(lon1, lat1, lon2, lat2)
+        """
+        Calculate haversine distance in meters (spherical; well within the
+        accuracy gap thresholds need). Reported lengths use geodesic_length.
+        """
         
-        return distance
+        return haversine(p1[0], p1[1], p2[0], p2[1])
     
     def _calculate_route_stats(
         self,
-        coords: List[List[float]],
-        profile: str
+        coords: np.ndarray,
+        profile: str,
+        length_m: Optional[float] = None
     ) -> Tuple[float, float]:
-        """Calculate route length and estimated time"""
+        """
+        Calculate route length and estimated time
         
-        if not coords or len(coords) < 2:
-            return 0.0, 0.0
+        Args:
+            coords: (N, 2) route coordinates
+            profile: Routing profile for speed estimation
+            length_m: Precomputed route length; skips the pass over coords
+        """
         
-        total_length = 0.0
+        coords = np.asarray(coords, dtype=np.float64)
+        if coords.shape[0] < 2:
+            return 0.0, 0.0
         
-        for i in range(len(coords) - 1):
-            lon1, lat1 = coords[i]
-            lon2, lat2 = coords[i+1]
-            
-            # Calculate geodesic distance
-            _, _, distance = GEOD.inv(lon1, lat1, lon2, lat2)
-            total_length += distance
+        if length_m is not None:
+            route_length = float(length_m)
+        else:
+            # Ellipsoidal length for reporting; gap checks use the cheaper haversine kernel
+            route_length = geodesic_length(coords)
         
         # Estimate time based on profile
-        speed_by_profile = {
-            'driving-car': 10.0,      # 36 km/h average city
-            'driving-hgv': 8.0,       # 29 km/h for trucks
-            'cycling-regular': 4.0,    # 14 km/h
-            'foot-walking': 1.4,      # 5 km/h
-        }
-        
-        avg_speed_mps = speed_by_profile.get(profile, 10.0)
-        total_time = total_length / avg_speed_mps
+        avg_speed_mps = SPEED_BY_PROFILE.get(profile, DEFAULT_SPEED_MPS)
+        total_time = route_length / avg_speed_mps
         
-        return total_length, total_time
+        return route_length, total_time
     
     def split_into_chunks(
         self,
-        route_coords: List[List[float]],
+        route_coords: np.ndarray,
         chunk_duration_s: int,
         profile: str = 'driving-car'
     ) -> List[Dict[str, Any]]:
@@ -590,7 +768,7 @@ class RouteCalculator:
         Split route into time-based chunks
         
         Args:
-            route_coords: Complete route coordinates
+            route_coords: Complete route coordinates, (N, 2) array or list of [lon, lat]
             chunk_duration_s: Target duration per chunk in seconds
             profile: Routing profile for speed estimation
         
@@ -598,73 +776,69 @@ class RouteCalculator:
             List of route chunks
         """
         
-        if not route_coords or len(route_coords) < 2:
+        coords = np.asarray(route_coords, dtype=np.float64)
+        if coords.ndim != 2 or coords.shape[0] < 2:
             return []
         
-        chunks = []
-        current_chunk = []
-        current_time = 0.0
-        current_length = 0.0
-        
         # Speed for time calculation
-        speed_by_profile = {
-            'driving-car': 10.0,
-            'driving-hgv': 8.0,
-            'cycling-regular': 4.0,
-            'foot-walking': 1.4,
-        }
-        avg_speed_mps = speed_by_profile.get(profile, 10.0)
+        avg_speed_mps = SPEED_BY_PROFILE.get(profile, DEFAULT_SPEED_MPS)
         
-        for i in range(len(route_coords) - 1):
-            current_chunk.append(route_coords[i])
-            
-            # Calculate segment length
-            lon1, lat1 = route_coords[i]
-            lon2, lat2 = route_coords[i+1]
-            _, _, segment_length = GEOD.inv(lon1, lat1, lon2, lat2)
-            segment_time = segment_length / avg_speed_mps
-            
-            current_length += segment_length
-            current_time += segment_time
-            
-            # Check if chunk is complete
-            if current_time >= chunk_duration_s:
-                # Complete current chunk
-                current_chunk.append(route_coords[i+1])
-                
-                chunk = {
-                    'chunk_id': len(chunks),
-                    'geometry': {
-                        'type': 'LineString',
-                        'coordinates': current_chunk
-                    },
-                    'length_m': current_length,
-                    'time_s': current_time,
-                    'start_point': current_chunk[0],
-                    'end_point': current_chunk[-1]
-                }
-                chunks.append(chunk)
-                
-                # Start new chunk
-                current_chunk = [route_coords[i+1]]
-                current_time = 0.0
-                current_length = 0.0
+        # Cumulative length and time at the end of each segment, in one pass
+        cum_length = np.cumsum(segment_lengths(coords))
+        cum_time = cum_length / avg_speed_mps
+        n_segments = cum_length.shape[0]
+        
+        chunks = []
+        chunk_start = 0
+        base_length = 0.0
+        base_time = 0.0
+        
+        # Each chunk ends at the first segment where its own time reaches the target
+        while chunk_start < n_segments:
+            end = int(np.searchsorted(cum_time, base_time + chunk_duration_s, side='left'))
+            end = max(end, chunk_start)
+            if end >= n_segments:
+                break
+            
+            chunks.append(self._make_chunk(
+                len(chunks), coords[chunk_start:end + 2],
+                float(cum_length[end] - base_length), float(cum_time[end] - base_time)
+            ))
+            
+            # Start new chunk at the end point of this one
+            chunk_start = end + 1
+            base_length = float(cum_length[end])
+            base_time = float(cum_time[end])
         
         # Add remaining points as final chunk
-        if len(current_chunk) > 1:
-            chunk = {
-                'chunk_id': len(chunks),
-                'geometry': {
-                    'type': 'LineString',
-                    'coordinates': current_chunk
-                },
-                'length_m': current_length,
-                'time_s': current_time,
-                'start_point': current_chunk[0],
-                'end_point': current_chunk[-1]
-            }
-            chunks.append(chunk)
+        if coords.shape[0] - chunk_start > 1:
+            chunks.append(self._make_chunk(
+                len(chunks), coords[chunk_start:],
+                float(cum_length[-1] - base_length), float(cum_time[-1] - base_time)
+            ))
         
         logger.info(f"Split route into {len(chunks)} chunks")
         
-        return chunks
\ No newline at end of file
+        return chunks
+    
+    def _make_chunk(
+        self,
+        chunk_id: int,
+        coords: np.ndarray,
+        length_m: float,
+        time_s: float
+    ) -> Dict[str, Any]:
+        """Build a chunk dict, converting coordinates back to GeoJSON lists"""
+        
+        chunk_coords = coords.tolist()
+        return {
+            'chunk_id': chunk_id,
+            'geometry': {
+                'type': 'LineString',
+                'coordinates': chunk_coords
+            },
+            'length_m': length_m,
+            'time_s': time_s,
+            'start_point': chunk_coords[0],
+            'end_point': chunk_coords[-1]
+        }
@@ -3,11 +3,22 @@ Route connector for joining disconnected street components
 """
 
 import logging
-from typing import Dict, Any, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional
 import networkx as nx
-import itertools
+import asyncio
+import heapq
+from collections import deque
+from itertools import chain
+import numpy as np
 from pyproj import Geod
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 
+from app.services._geo_numba import (
+    EARTH_RADIUS_M, geodesic_length, haversine, haversine_arr, haversine_matrix, haversine_pairwise,
+    segment_lengths
+)
+from app.services.graph_builder import q
 from app.services.ors_client import ORSClient
 from app.config import settings
 
@@ -19,23 +30,74 @@ GEOD = Geod(ellps="WGS84")
 # Gap handling thresholds
 SNAP_EPS_M = 1.0    # If within this, just snap (no routing needed)
 SMALL_JOIN_M = 15.0  # If <= this, don't call ORS; just connect with direct segment
+CENTROID_GATE_M = 5000.0  # Component pairs with centroids further apart are never searched
+CANDIDATE_QUERY_CHUNK = 1024  # Query points per KD-tree batch in the candidate search (L2-sized)
+PAIR_BATCH_SIZE = 8  # Component pairs searched concurrently per pruning round
+BRIDGE_CONCURRENCY = 8  # Bridge fetches in flight while a circuit's gaps are bridged
+
+# Shared attributes of edges added by _add_route_to_graph
+_CONNECTOR_BASE = {'highway': 'connector', 'name': 'Connection route', 'oneway': False, 'osm_id': '', 'is_connector': True}
+_ROUTE_BASE = {'highway': 'route', 'name': '', 'oneway': False, 'osm_id': '', 'is_connector': False}
+_SOURCE_LINK_BASE = {**_CONNECTOR_BASE, 'name': 'Source connection'}
+_TARGET_LINK_BASE = {**_CONNECTOR_BASE, 'name': 'Target connection'}
+
+# (nodes, KD-tree, centroid, radius in meters, (sum_lon, sum_lat, n)) for one component
+ComponentIndex = Tuple[List[Tuple], cKDTree, Tuple[float, float], float, Tuple[float, float, int]]
+
+
+def node_components(G: nx.DiGraph, connection: str = 'weak') -> List[set]:
+    """
+    Weakly or strongly connected node sets of G, from scipy's compiled
+    connected_components on a CSR adjacency. Components come back in order
+    of their first node in G, like networkx's UnionFind groups.
+    """
+    nodes = list(G)
+    if not nodes:
+        return []
+    
+    csr = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=None, format='csr')
+    n_comp, labels = connected_components(csr, directed=True, connection=connection)
+    
+    # Group node indexes by label; a stable sort keeps each group's first index minimal
+    order = np.argsort(labels, kind='stable')
+    groups = np.split(order, np.cumsum(np.bincount(labels, minlength=n_comp))[:-1])
+    groups.sort(key=lambda g: g[0])
+    return [{nodes[i] for i in g} for g in groups]
+
+
+def _chord_to_meters(chords: np.ndarray) -> np.ndarray:
+    """
+    Convert unit-sphere chord lengths to haversine distance in meters.
+    Exact for spherical distances and monotonic, so KD-tree order is kept;
+    use RouteConnector._haversine_geodesic where edge lengths must be exact.
+    """
+    return 2.0 * EARTH_RADIUS_M * np.arcsin(np.minimum(chords * 0.5, 1.0))
+
+
+def _unit_vectors(lonlat: np.ndarray) -> np.ndarray:
+    """Unit-sphere (x, y, z) points for an (N, 2) lon/lat array"""
+    lon = np.radians(lonlat[:, 0])
+    lat = np.radians(lonlat[:, 1])
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
 
 
 def _align(u: Tuple[float, float], v: Tuple[float, float], coords: List[List[float]]) -> List[List[float]]:
     """
     Align geometry to run from u to v.
     Reverse if needed and snap endpoints exactly to u/v.
+    Returns a new outer list; coords itself is never modified, and interior
+    points are shared with it rather than copied.
     """
     if not coords or len(coords) < 2:
         return [list(u), list(v)]
     
-    def sqd(A, B):
-        """Squared distance for comparison"""
-        return (A[0] - B[0])**2 + (A[1] - B[1])**2
-    
-    # Check if we need to reverse
-    if sqd(coords[0], list(u)) > sqd(coords[0], list(v)):
+    # Check if we need to reverse (squared distances are enough to compare)
+    x, y = coords[0][0], coords[0][1]
+    if (x - u[0]) ** 2 + (y - u[1]) ** 2 > (x - v[0]) ** 2 + (y - v[1]) ** 2:
         coords = list(reversed(coords))
+    else:
+        coords = list(coords)
     
     # Snap endpoints exactly to u/v
     coords[0] = [u[0], u[1]]
@@ -51,11 +113,16 @@ class RouteConnector:
         self.ors_client = ors_client
         self.max_gap = settings.max_gap_meters
         self.coverage_mode = coverage_mode  # True = prioritize coverage with U-turns, False = standard navigation
+        
+        # Caps concurrent routing/matrix calls while candidate pairs are searched in parallel
+        self._route_slots = asyncio.Semaphore(settings.ors_max_concurrency)
+        self._bridge_slots = asyncio.Semaphore(BRIDGE_CONCURRENCY)
     
     async def connect_components(
         self,
         G: nx.MultiDiGraph,
-        max_candidates: int = 5
+        max_candidates: int = 5,
+        inplace: bool = False
     ) -> nx.MultiDiGraph:
         """
         Connect disconnected components using ORS routing
@@ -63,33 +130,76 @@ class RouteConnector:
         Args:
             G: Street graph with potentially disconnected components
             max_candidates: Maximum candidate pairs to consider per component
+            inplace: Add connectors to G itself instead of a copy. G must be
+                mutable (not a subgraph view); on error the connectors added
+                so far are removed again
         
         Returns:
-            Connected graph
+            Connected graph (G itself when inplace)
         """
         
+        # Get weakly connected components
+        components = node_components(G)
+        
         # Check if already connected
-        if nx.is_weakly_connected(G):
+        if len(components) <= 1:
             logger.info("Graph is already connected")
             return G
         
-        # Get weakly connected components
-        components = list(nx.weakly_connected_components(G))
         logger.info(f"Found {len(components)} disconnected components")
         
-        if len(components) == 1:
-            return G
-        
-        # Sort components by size (connect largest first)
-        components = sorted(components, key=len, reverse=True)
-        component_subgraphs = [G.subgraph(c).copy() for c in components]
+        # Sort components by size (connect largest first); ids stay stable across merges
+        components = dict(enumerate(sorted(components, key=len, reverse=True)))
+        node_to_comp = {node: cid for cid, comp in components.items() for node in comp}
         
         # Log component sizes
-        for i, comp in enumerate(component_subgraphs):
-            logger.info(f"Component {i}: {comp.number_of_nodes()} nodes, {comp.number_of_edges()} edges")
+        for i, comp in components.items():
+            logger.info(f"Component {i}: {len(comp)} nodes")
+        
+        indexes = self._build_indexes(components, node_to_comp)
         
         # Connect components iteratively with safety checks
-        G_connected = G.copy()
+        G_connected = G if inplace else G.copy()
+        added_edges = []
+        added_nodes = []
+        try:
+            await self._connect_loop(
+                G_connected, components, node_to_comp, indexes,
+                max_candidates, added_edges, added_nodes
+            )
+        except Exception:
+            if inplace:
+                logger.warning(f"Rolling back {len(added_edges)} connector edges after error")
+                G.remove_edges_from(added_edges)
+                G.remove_nodes_from(added_nodes)
+            raise
+        
+        # Final connectivity check; merges were tracked on the component sets,
+        # so confirm against the graph only when they say we're done
+        if len(components) == 1 and len(node_components(G_connected)) != 1:
+            logger.error("Component tracking reports one component but the graph is not weakly connected")
+        elif len(components) == 1:
+            logger.info("Successfully connected all components")
+        else:
+            logger.warning(f"Graph still has {len(components)} disconnected components")
+        
+        return G_connected
+    
+    async def _connect_loop(
+        self,
+        G_connected: nx.MultiDiGraph,
+        components: Dict[int, set],
+        node_to_comp: Dict[Tuple, int],
+        indexes: Dict[int, ComponentIndex],
+        max_candidates: int,
+        added_edges: List[Tuple],
+        added_nodes: List[Tuple]
+    ):
+        """
+        Merge components until connected or out of iterations; updates components
+        and their spatial indexes in place
+        """
+        
         max_iterations = 10
         iteration = 0
         previous_component_count = len(components)
@@ -99,8 +209,10 @@ class RouteConnector:
             logger.info(f"Connection iteration {iteration}/{max_iterations}")
             
             # Find best pair to connect
+            cids = list(indexes)
             best_connection = await self._find_best_connection(
-                component_subgraphs,
+                G_connected,
+                list(indexes.values()),
                 max_candidates
             )
             
@@ -109,13 +221,14 @@ class RouteConnector:
                 break
             
             comp_i, comp_j, route_coords, distance, source_node, target_node = best_connection
+            comp_i, comp_j = cids[comp_i], cids[comp_j]
             
             logger.info(f"Connecting components {comp_i} and {comp_j} with {distance:.0f}m route")
             logger.info(f"  Source node: {source_node}, Target node: {target_node}")
             logger.info(f"  Route has {len(route_coords)} coordinates")
             
             # Add connecting edges to graph with proper node connections
-            self._add_route_to_graph(
+            added_edges += self._add_route_to_graph(
                 G_connected, 
                 route_coords, 
                 source_node=source_node,
@@ -123,9 +236,29 @@ class RouteConnector:
                 is_connector=True
             )
             
-            # Recompute components
-            components = list(nx.weakly_connected_components(G_connected))
-            component_subgraphs = [G_connected.subgraph(c).copy() for c in components]
+            # Merge every component the connector chain touched into the largest of them,
+            # relabelling only the smaller ones; route points not yet in the graph join too
+            chain = [source_node] + [q(c) for c in route_coords] + [target_node]
+            touched = {node_to_comp[n] for n in chain if n in node_to_comp}
+            keep = max(touched, key=lambda cid: len(components[cid]))
+            merged = components[keep]
+            parts = [indexes[keep]]
+            for cid in touched - {keep}:
+                absorbed = components.pop(cid)
+                parts.append(indexes.pop(cid))
+                for node in absorbed:
+                    node_to_comp[node] = keep
+                merged |= absorbed
+            new_nodes = []
+            for node in chain:
+                if node not in node_to_comp:
+                    node_to_comp[node] = keep
+                    merged.add(node)
+                    new_nodes.append(node)
+            added_nodes += new_nodes
+            
+            # Only the merged component's index is rebuilt, from its parts' cached arrays
+            indexes[keep] = self._merge_indexes(parts, new_nodes)
             
             new_component_count = len(components)
             logger.info(f"Reduced to {new_component_count} components (was {previous_component_count})")
@@ -138,23 +271,20 @@ class RouteConnector:
                     break
             
             previous_component_count = new_component_count
-        
-        # Final connectivity check
-        if nx.is_weakly_connected(G_connected):
-            logger.info("Successfully connected all components")
-        else:
-            remaining = nx.number_weakly_connected_components(G_connected)
-            logger.warning(f"Graph still has {remaining} disconnected components")
-        
-        return G_connected
     
     async def _find_best_connection(
         self,
-        components: List[nx.DiGraph],
+        G: nx.MultiDiGraph,
+        components: List[ComponentIndex],
         max_candidates: int
     ) -> Optional[Tuple[int, int, List[List[float]], float, Tuple, Tuple]]:
         """Find best connection between components
         
+        Args:
+            G: Graph containing all components
+            components: (nodes, spatial index, centroid, radius, coordinate sums) per component
+            max_candidates: Maximum candidate pairs to consider
+        
         Returns:
             (comp_i_idx, comp_j_idx, route_coords, distance, source_node, target_node)
         """
@@ -163,31 +293,61 @@ class RouteConnector:
             return None
         
         best = None
-        best_distance = float('inf')
-        
-        # Try connecting each pair of components
-        for i, j in itertools.combinations(range(len(components)), 2):
-            comp_i = components[i]
-            comp_j = components[j]
+        best_key = (float('inf'), 0, 0)
+        
+        # Centroid pre-filter for all pairs at once, before any candidate search
+        centroids = np.array([comp[2] for comp in components], dtype=np.float64)
+        radii = np.array([comp[3] for comp in components], dtype=np.float64)
+        centroid_dists = haversine_pairwise(centroids, centroids)
+        rows, cols = np.triu_indices(len(components), k=1)
+        dists = centroid_dists[rows, cols]
+        near = dists <= CENTROID_GATE_M
+        rows, cols, dists = rows[near], cols[near], dists[near]
+        logger.debug(f"{len(rows)} component pairs within {CENTROID_GATE_M:.0f}m centroid gate")
+        
+        # No node pair can be closer than centroid distance minus both radii, and a
+        # connection is never shorter than its straight distance - so pairs go in
+        # lower-bound order and the search stops once the bound exceeds the best so far
+        lower = dists - radii[rows] - radii[cols]
+        order = np.argsort(lower, kind='stable')
+        pairs = list(zip(rows[order].tolist(), cols[order].tolist(), lower[order].tolist()))
+        
+        pos = 0
+        while pos < len(pairs):
+            batch = []
+            while pos < len(pairs) and len(batch) < PAIR_BATCH_SIZE:
+                i, j, bound = pairs[pos]
+                if bound > best_key[0]:
+                    break
+                batch.append((i, j))
+                pos += 1
             
-            # Find closest nodes between components
-            connection = await self._find_closest_nodes(
-                comp_i,
-                comp_j,
-                max_candidates
-            )
+            if not batch:
+                break
             
-            if connection and connection[1] < best_distance:
-                # connection is (route_coords, distance, source_node, target_node)
-                best = (i, j, connection[0], connection[1], connection[2], connection[3])
-                best_distance = connection[1]
+            # Find closest nodes for this round of pairs concurrently
+            connections = await asyncio.gather(*(
+                self._find_closest_nodes(G, components[i], components[j], max_candidates)
+                for i, j in batch
+            ))
+            
+            for (i, j), connection in zip(batch, connections):
+                # Ties go to the lowest (i, j), as in a row-major scan
+                if connection and (connection[1], i, j) < best_key:
+                    # connection is (route_coords, distance, source_node, target_node)
+                    best = (i, j, connection[0], connection[1], connection[2], connection[3])
+                    best_key = (connection[1], i, j)
+        
+        if pos < len(pairs):
+            logger.debug(f"Pruned {len(pairs) - pos} component pairs by centroid lower bound")
         
         return best
     
     async def _find_closest_nodes(
         self,
-        comp1: nx.DiGraph,
-        comp2: nx.DiGraph,
+        G: nx.MultiDiGraph,
+        comp1: ComponentIndex,
+        comp2: ComponentIndex,
         max_candidates: int
     ) -> Optional[Tuple[List[List[float]], float, Tuple, Tuple]]:
         """Find closest nodes between two components
@@ -196,29 +356,40 @@ class RouteConnector:
             (route_coords, distance, source_node, target_node)
         """
         
-        # Stage 1: Use component centroids for pre-filtering
-        centroid1 = self._get_component_centroid(comp1)
-        centroid2 = self._get_component_centroid(comp2)
-        
-        # Rough distance check
-        centroid_dist = self._haversine(centroid1, centroid2)
-        
-        # Skip if components are too far apart (> 5km)
-        if centroid_dist > 5000:
-            logger.debug(f"Components too far apart: {centroid_dist:.0f}m")
-            return None
-        
-        # Stage 2: Find k-nearest node pairs
-        candidates = []
-        
-        for node1 in comp1.nodes():
-            for node2 in comp2.nodes():
-                dist = self._haversine(node1, node2)
-                candidates.append((node1, node2, dist))
+        nodes1, tree1 = comp1[0], comp1[1]
+        nodes2, tree2 = comp2[0], comp2[1]
+        
+        # Stage 1: centroid pre-filtering is done by the caller for all pairs at once
+        
+        # Stage 2: k-NN query of the smaller component against the larger one's KD-tree,
+        # in fixed-size chunks feeding a bounded max-heap of the best pairs so far.
+        # Trees hold unit-sphere points, so chord order is great-circle order
+        swap = len(nodes1) > len(nodes2)
+        query_tree, query_pts = (tree1, tree2.data) if swap else (tree2, tree1.data)
+        k = min(max_candidates, query_tree.n)
+        heap = []  # (-chord, i, j)
+        for start in range(0, len(query_pts), CANDIDATE_QUERY_CHUNK):
+            dists, idx = query_tree.query(query_pts[start:start + CANDIDATE_QUERY_CHUNK], k=k)
+            dists = np.asarray(dists).reshape(-1)
+            idx = np.asarray(idx).reshape(-1)
+            
+            # Only this chunk's best k can enter the heap
+            sel = np.argpartition(dists, k - 1)[:k] if k < dists.size else np.arange(dists.size)
+            for dist, q, t in zip(dists[sel].tolist(), (start + sel // k).tolist(), idx[sel].tolist()):
+                item = (-dist, t, q) if swap else (-dist, q, t)
+                if len(heap) < max_candidates:
+                    heapq.heappush(heap, item)
+                else:
+                    heapq.heappushpop(heap, item)
         
-        # Sort by distance and take top candidates
-        candidates.sort(key=lambda x: x[2])
-        candidates = candidates[:max_candidates]
+        # Chord lengths convert straight to haversine meters, nearest first
+        heap.sort(reverse=True)
+        chords = np.array([-item[0] for item in heap], dtype=np.float64)
+        meters = _chord_to_meters(chords).tolist()
+        candidates = [
+            (nodes1[i], nodes2[j], distance)
+            for (_, i, j), distance in zip(heap, meters)
+        ]
         
         # Stage 3: Handle based on coverage mode
         best_route = None
@@ -226,45 +397,78 @@ class RouteConnector:
         best_source = None
         best_target = None
         
+        # Local shortcuts are resolved first; candidates ahead of the first one need ORS
+        shortcut = None
+        ors_candidates = []
         for node1, node2, straight_dist in candidates:
             # In coverage mode, for small gaps just connect directly (allowing U-turns)
             if self.coverage_mode and straight_dist < 50:  # Within 50m
-                logger.info(f"Coverage mode: Direct connection for {straight_dist:.1f}m gap")
                 # Create direct path (allows U-turn if on same street)
-                best_route = [list(node1), list(node2)]
-                best_distance = straight_dist
-                best_source = node1
-                best_target = node2
+                shortcut = ([list(node1), list(node2)], straight_dist, node1, node2,
+                            f"Coverage mode: Direct connection for {straight_dist:.1f}m gap")
                 break
             
             # Check if nodes might be on the same street (very close)
             if self.coverage_mode and straight_dist < 100:
                 # Try to create a U-turn path if they're likely on the same street
-                u_turn_path = self._create_u_turn_path(comp1, comp2, node1, node2)
+                u_turn_path = self._create_u_turn_path(G, node1, node2)
                 if u_turn_path:
-                    logger.info(f"Coverage mode: U-turn path found for {straight_dist:.1f}m gap")
-                    best_route = u_turn_path
-                    best_distance = self._calculate_path_distance(u_turn_path)
-                    best_source = node1
-                    best_target = node2
+                    shortcut = (u_turn_path, self._calculate_path_distance(u_turn_path), node1, node2,
+                                f"Coverage mode: U-turn path found for {straight_dist:.1f}m gap")
                     break
             
-            # Otherwise use routing API
+            ors_candidates.append((node1, node2, straight_dist))
+        
+        # Otherwise use routing API: rank all candidates with one matrix call,
+        # then fetch the polyline only for the pair we pick
+        found_good = False
+        chosen = None
+        if len(ors_candidates) == 1:
+            chosen = ors_candidates[0]
+        elif ors_candidates and not getattr(self.ors_client, 'matrix_available', True):
+            # No /matrix on this deployment: probe candidates with single routes instead
+            chosen = await self._probe_candidates(ors_candidates)
+        elif ors_candidates:
+            sources = list(dict.fromkeys(node1 for node1, _, _ in ors_candidates))
+            destinations = list(dict.fromkeys(node2 for _, node2, _ in ors_candidates))
+            source_idx = {node: i for i, node in enumerate(sources)}
+            destination_idx = {node: i for i, node in enumerate(destinations)}
+            
             try:
-                # Get route from ORS
-                coords, distance = await self.ors_client.get_route(node1, node2)
+                async with self._route_slots:
+                    matrix = await self.ors_client.get_matrix(sources, destinations)
+            except Exception as e:
+                logger.warning(f"Failed to get distance matrix for {len(ors_candidates)} candidates: {e}")
+                matrix = None
+            
+            if matrix is None:
+                chosen = ors_candidates[0]
+            else:
+                # Same pick as a sequential scan: first good route, else the shortest
+                best_matrix_distance = float('inf')
+                for node1, node2, straight_dist in ors_candidates:
+                    distance = matrix[source_idx[node1]][destination_idx[node2]]
+                    if distance is not None and distance < best_matrix_distance:
+                        chosen = (node1, node2, straight_dist)
+                        best_matrix_distance = distance
+                        if distance < straight_dist * 1.5:
+                            break
+        
+        if chosen:
+            node1, node2, straight_dist = chosen
+            try:
+                coords, distance = await self._cached_route(node1, node2)
                 
-                if coords and distance < best_distance:
+                if coords:
                     best_route = coords
                     best_distance = distance
                     best_source = node1
                     best_target = node2
                     logger.debug(f"  New best route: {node1} -> {node2}, distance={distance:.1f}m")
                     
-                    # If we found a good route (< 1.5x straight distance), stop searching
-                    if distance < straight_dist * 1.5:
-                        break
-                        
+                    # A good route (< 1.5x straight distance) wins over a later shortcut
+                    found_good = distance < straight_dist * 1.5
+                    
             except Exception as e:
                 logger.warning(f"Failed to get route between {node1} and {node2}: {e}")
                 # In coverage mode, fall back to direct connection for failed routing
@@ -275,6 +479,10 @@ class RouteConnector:
                     best_target = node2
                     logger.info(f"Coverage mode: Using direct fallback for failed routing")
         
+        if shortcut and not found_good:
+            best_route, best_distance, best_source, best_target, message = shortcut
+            logger.info(message)
+        
         if best_route:
             logger.info(f"Found best connection: {best_source} -> {best_target}, distance: {best_distance:.1f}m")
             return (best_route, best_distance, best_source, best_target)
@@ -282,10 +490,36 @@ class RouteConnector:
         logger.warning("No route found between components")
         return None
     
+    async def _probe_candidates(
+        self,
+        candidates: List[Tuple[Tuple, Tuple, float]]
+    ) -> Tuple[Tuple, Tuple, float]:
+        """
+        Pick a candidate by routing each in turn: the first good route
+        (< 1.5x straight distance), else the shortest. The ORS client memoizes
+        routes, so fetching the winner's polyline afterwards costs nothing extra.
+        """
+        
+        chosen = candidates[0]
+        best_distance = float('inf')
+        for node1, node2, straight_dist in candidates:
+            try:
+                coords, distance = await self._cached_route(node1, node2)
+            except Exception as e:
+                logger.warning(f"Failed to probe route between {node1} and {node2}: {e}")
+                continue
+            
+            if coords and distance < best_distance:
+                chosen = (node1, node2, straight_dist)
+                best_distance = distance
+                if distance < straight_dist * 1.5:
+                    break
+        
+        return chosen
+    
     def _create_u_turn_path(
         self,
-        comp1: nx.DiGraph,
-        comp2: nx.DiGraph, 
+        G: nx.MultiDiGraph,
         node1: Tuple[float, float],
         node2: Tuple[float, float]
     ) -> Optional[List[List[float]]]:
@@ -294,41 +528,101 @@ class RouteConnector:
         # Check if both nodes have edges in their components that might connect
         # This is a simplified check - in reality would need street name matching
         
-        # Find if there's a common neighbor (intersection) nearby
-        neighbors1 = set(comp1.neighbors(node1)) | set(comp1.predecessors(node1))
-        neighbors2 = set(comp2.neighbors(node2)) | set(comp2.predecessors(node2))
+        # Find if there's a common neighbor (intersection) nearby, reading the
+        # adjacency of G directly rather than a per-component subgraph
+        neighbors1 = list(G.succ[node1].keys() | G.pred[node1].keys())
+        neighbors2 = list(G.succ[node2].keys() | G.pred[node2].keys())
+        if not neighbors1 or not neighbors2:
+            return None
         
-        # Look for nearby common points
-        for n1 in neighbors1:
-            for n2 in neighbors2:
-                dist = self._haversine(n1, n2)
-                if dist < 20:  # Very close, likely same intersection
-                    # Create path: node1 -> n1 -> n2 -> node2
-                    return [list(node1), list(n1), list(n2), list(node2)]
+        # Look for nearby common points: all neighbor pairs in one call, first hit in scan order
+        dists = haversine_matrix(
+            np.array(neighbors1, dtype=np.float64),
+            np.array(neighbors2, dtype=np.float64)
+        )
+        hits = np.flatnonzero(dists < 20)  # Very close, likely same intersection
+        if hits.size == 0:
+            return None
         
-        return None
+        # Create path: node1 -> n1 -> n2 -> node2
+        n1 = neighbors1[hits[0] // len(neighbors2)]
+        n2 = neighbors2[hits[0] % len(neighbors2)]
+        return [list(node1), list(n1), list(n2), list(node2)]
     
     def _calculate_path_distance(self, coords: List[List[float]]) -> float:
         """Calculate total distance along a path"""
-        total = 0
-        for i in range(len(coords) - 1):
-            total += self._haversine(
-                (coords[i][0], coords[i][1]),
-                (coords[i+1][0], coords[i+1][1])
+        return float(segment_lengths(np.asarray(coords, dtype=np.float64)).sum())
+    
+    def _build_indexes(
+        self,
+        components: Dict[int, set],
+        node_to_comp: Dict[Tuple, int]
+    ) -> Dict[int, ComponentIndex]:
+        """
+        Build every component's spatial index from one pass over all nodes: unit
+        vectors are computed once for the whole graph, then rows are grouped by
+        component so each index gets contiguous slices
+        """
+        
+        nodes = list(node_to_comp)
+        lonlat = np.array(nodes, dtype=np.float64)
+        xyz = _unit_vectors(lonlat)
+        labels = np.fromiter(node_to_comp.values(), dtype=np.intp, count=len(nodes))
+        
+        order = np.argsort(labels, kind='stable')
+        bounds = np.cumsum(np.bincount(labels, minlength=max(components) + 1)).tolist()
+        lonlat, xyz = lonlat[order], xyz[order]
+        order = order.tolist()
+        
+        indexes = {}
+        for cid in components:
+            lo, hi = (bounds[cid - 1] if cid else 0), bounds[cid]
+            sum_lon, sum_lat = lonlat[lo:hi].sum(axis=0).tolist()
+            indexes[cid] = self._index_from_points(
+                [nodes[i] for i in order[lo:hi]], xyz[lo:hi], (sum_lon, sum_lat, hi - lo)
             )
-        return total
+        return indexes
     
-    def _get_component_centroid(self, component: nx.DiGraph) -> Tuple[float, float]:
-        """Get centroid of component nodes"""
+    def _merge_indexes(self, parts: List[ComponentIndex], extra_nodes: List[Tuple]) -> ComponentIndex:
+        """
+        Build the spatial index of a merged component from its parts' cached node
+        lists, unit vectors and coordinate sums, plus any nodes new to the graph
+        """
         
-        nodes = list(component.nodes())
-        if not nodes:
-            return (0, 0)
+        nodes = [node for part in parts for node in part[0]]
+        arrays = [part[1].data for part in parts]
+        sum_lon = sum(part[4][0] for part in parts)
+        sum_lat = sum(part[4][1] for part in parts)
+        count = sum(part[4][2] for part in parts)
+        
+        if extra_nodes:
+            lonlat = np.array(extra_nodes, dtype=np.float64)
+            nodes += extra_nodes
+            arrays.append(_unit_vectors(lonlat))
+            extra_lon, extra_lat = lonlat.sum(axis=0).tolist()
+            sum_lon += extra_lon
+            sum_lat += extra_lat
+            count += len(extra_nodes)
+        
+        return self._index_from_points(nodes, np.concatenate(arrays), (sum_lon, sum_lat, count))
+    
+    def _index_from_points(
+        self,
+        nodes: List[Tuple],
+        xyz: np.ndarray,
+        sums: Tuple[float, float, int]
+    ) -> ComponentIndex:
+        """
+        KD-tree over unit-sphere points, centroid from the running coordinate sums
+        and radius (furthest node from the centroid) for one component
+        """
         
-        lons = [node[0] for node in nodes]
-        lats = [node[1] for node in nodes]
+        sum_lon, sum_lat, count = sums
+        centroid = (sum_lon / count, sum_lat / count)
+        center = _unit_vectors(np.array([centroid], dtype=np.float64))
+        radius = float(_chord_to_meters(np.sqrt(((xyz - center) ** 2).sum(axis=1).max())))
         
-        return (sum(lons) / len(lons), sum(lats) / len(lats))
+        return nodes, cKDTree(xyz), centroid, radius, sums
     
     def _add_route_to_graph(
         self,
@@ -337,95 +631,131 @@ class RouteConnector:
         source_node: Optional[Tuple] = None,
         target_node: Optional[Tuple] = None,
         is_connector: bool = False
-    ):
-        """Add route coordinates as edges to graph, properly connecting to source/target nodes"""
-        
-        if len(coords) < 2:
-            return
-        
-        # Connect source node to first route coordinate if needed
-        first_coord = tuple(coords[0])
+    ) -> List[Tuple]:
+        """
+        Add route coordinates as edges to graph, properly connecting to source/target nodes
         
-        if source_node and source_node != first_coord:
-            length_m = self._haversine(source_node, first_coord)
-            logger.info(f"Connecting source {source_node} to route start {first_coord} ({length_m:.1f}m)")
-            
-            edge_data = {
-                'length': length_m,
-                'time': length_m / 10.0,
-                'geometry': [list(source_node), list(first_coord)],
-                'highway': 'connector',
-                'name': 'Source connection',
-                'oneway': False,
-                'osm_id': '',
-                'is_connector': True
-            }
-            
-            G.add_edge(source_node, first_coord, **edge_data)
-            reverse_data = edge_data.copy()
-            reverse_data['geometry'] = [list(first_coord), list(source_node)]
-            G.add_edge(first_coord, source_node, **reverse_data)
-        
-        # Add route edges
-        for i in range(len(coords) - 1):
-            start = tuple(coords[i])
-            end = tuple(coords[i + 1])
-            
-            # Calculate edge properties
-            length_m = self._haversine(start, end)
-            
-            edge_data = {
-                'length': length_m,
-                'time': length_m / 10.0,
-                'geometry': [list(start), list(end)],
-                'highway': 'connector' if is_connector else 'route',
-                'name': 'Connection route' if is_connector else '',
-                'oneway': False,
-                'osm_id': '',
-                'is_connector': is_connector
-            }
-            
-            # Add bidirectional edges
-            G.add_edge(start, end, **edge_data)
-            
-            reverse_data = edge_data.copy()
-            reverse_data['geometry'] = [list(end), list(start)]
-            G.add_edge(end, start, **reverse_data)
+        Returns:
+            (u, v, key) of every edge added
+        """
         
-        # Connect last route coordinate to target node if needed
-        last_coord = tuple(coords[-1])
+        if len(coords) < 2:
+            return []
         
-        if target_node and target_node != last_coord:
-            length_m = self._haversine(last_coord, target_node)
-            logger.info(f"Connecting route end {last_coord} to target {target_node} ({length_m:.1f}m)")
-            
-            edge_data = {
-                'length': length_m,
-                'time': length_m / 10.0,
-                'geometry': [list(last_coord), list(target_node)],
-                'highway': 'connector',
-                'name': 'Target connection',
-                'oneway': False,
-                'osm_id': '',
-                'is_connector': True
-            }
-            
-            G.add_edge(last_coord, target_node, **edge_data)
-            reverse_data = edge_data.copy()
-            reverse_data['geometry'] = [list(target_node), list(last_coord)]
-            G.add_edge(target_node, last_coord, **reverse_data)
+        # Node chain source -> route -> target as one tuple list (tuples built once per point),
+        # quantized like graph nodes so a route point on an existing node hashes equal to it
+        nodes = [q(c) for c in coords]
+        first_coord = nodes[0]
+        last_coord = nodes[-1]
+        link_source = bool(source_node) and source_node != first_coord
+        link_target = bool(target_node) and target_node != last_coord
+        if link_source:
+            nodes.insert(0, source_node)
+        if link_target:
+            nodes.append(target_node)
+        
+        # All segment lengths in one vectorized geodesic call over an (N, 2) array
+        arr = np.array(nodes, dtype=np.float64)
+        lengths = self._haversine_array(arr[:-1, 0], arr[:-1, 1], arr[1:, 0], arr[1:, 1]).tolist()
+        
+        if link_source:
+            logger.info(f"Connecting source {source_node} to route start {first_coord} ({lengths[0]:.1f}m)")
+        if link_target:
+            logger.info(f"Connecting route end {last_coord} to target {target_node} ({lengths[-1]:.1f}m)")
+        
+        # One [lon, lat] list per point, shared by the forward and reverse geometries
+        points = [list(n) for n in nodes]
+        
+        # Per-edge tuples are built with only what varies; add_edges_from merges a
+        # module-level template into each edge's attribute dict for a whole run.
+        # networkx still stores a full dict per edge, so this saves building the
+        # constant fields and the reverse-edge copy, not per-edge memory
+        def run(lo, hi):
+            edges = []
+            for i in range(lo, hi):
+                length_m = lengths[i]
+                edges.append((nodes[i], nodes[i + 1], {
+                    'length': length_m, 'time': length_m / 10.0, 'geometry': [points[i], points[i + 1]]
+                }))
+                edges.append((nodes[i + 1], nodes[i], {
+                    'length': length_m, 'time': length_m / 10.0, 'geometry': [points[i + 1], points[i]]
+                }))
+            return edges
+        
+        # Source link, route body, target link - inserted in that order
+        lo = 1 if link_source else 0
+        hi = len(lengths) - 1 if link_target else len(lengths)
+        batches = []
+        if link_source:
+            batches.append((run(0, 1), _SOURCE_LINK_BASE))
+        batches.append((run(lo, hi), _CONNECTOR_BASE if is_connector else _ROUTE_BASE))
+        if link_target:
+            batches.append((run(hi, hi + 1), _TARGET_LINK_BASE))
+        
+        added = []
+        for edges, base in batches:
+            keys = G.add_edges_from(edges, **base)
+            added.extend((u, v, key) for (u, v, _), key in zip(edges, keys))
+        return added
     
-    def _haversine(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        """Calculate haversine distance in meters"""
-        
-        lon1, lat1 = p1
-        lon2, lat2 = p2
+    async def _cached_route(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        profile: str = 'driving-car'
+    ) -> Tuple[List[List[float]], float]:
+        """ORS get_route under the routing concurrency cap (the client memoizes it)"""
+        async with self._route_slots:
+            return await self.ors_client.get_route(start, end, profile=profile)
+    
+    async def route_between_points(
+        self,
+        start: List[float],
+        end: List[float],
+        profile: str = 'driving-car'
+    ) -> List[List[float]]:
+        """
+        Route polyline between two points for stitching, fetched like the
+        connector's own bridge requests
+        """
+        return await self._cached_bridge(start, end, profile)
+    
+    async def _cached_bridge(
+        self,
+        start: List[float],
+        end: List[float],
+        profile: str = 'driving-car'
+    ) -> List[List[float]]:
+        """Bridge polyline between two route points (the ORS client memoizes the route)"""
+        async with self._bridge_slots:
+            if hasattr(self.ors_client, 'route_between_points'):
+                bridge = await self.ors_client.route_between_points(start, end, profile=profile)
+            else:
+                bridge, _ = await self.ors_client.get_route(tuple(start), tuple(end), profile=profile)
+        # Callers snap the ends in place, so hand out a copy
+        return list(bridge) if bridge else bridge
+    
+    def _haversine_geodesic(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
+        """Calculate geodesic (WGS84) distance in meters"""
         
         # Use pyproj for accurate calculation
-        _, _, distance = GEOD.inv(lon1, lat1, lon2, lat2)
+        _, _, distance = GEOD.inv(p1[0], p1[1], p2[0], p2[1])
         
         return distance
     
+    def _haversine_array(
+        self,
+        lons1: np.ndarray,
+        lats1: np.ndarray,
+        lons2: np.ndarray,
+        lats2: np.ndarray
+    ) -> np.ndarray:
+        """Geodesic (WGS84) distances in meters for arrays of point pairs, in one pyproj call"""
+        
+        _, _, distances = GEOD.inv(lons1, lats1, lons2, lats2)
+        
+        return np.asarray(distances)
+    
     async def bridge_route_gaps(
         self,
         G: nx.MultiDiGraph,
@@ -433,7 +763,7 @@ class RouteConnector:
         max_gap: float = None,
         profile: str = 'driving-car',
         use_edge_keys: bool = False
-    ) -> List[List[float]]:
+    ) -> Tuple[List[List[float]], float]:
         """
         Bridge gaps in Eulerian circuit to create continuous route
         
@@ -445,68 +775,123 @@ class RouteConnector:
             use_edge_keys: Whether circuit contains edge keys
         
         Returns:
-            Continuous route coordinates
+            (continuous route coordinates, route length in meters)
         """
         
         if not circuit:
-            return []
+            return [], 0.0
         
-        out = []
         gaps_bridged = 0
         total_gap_distance = 0
         
+        # Geometry lookup built in one pass over the edges instead of per-step
+        # get_edge_data calls; without keys, keep the shortest parallel edge
+        missing = object()
+        shortest_geom = None
+        
+        def shortest_parallel():
+            """(u, v) -> (geometry, length) of the shortest parallel edge, one pass over G"""
+            lookup = {}
+            best_length = {}
+            for u, v, data in G.edges(data=True):
+                length = data.get('length', float('inf'))
+                if (u, v) not in best_length or length < best_length[(u, v)]:
+                    best_length[(u, v)] = length
+                    lookup[(u, v)] = (data.get('geometry'), data.get('length'))
+            return lookup
+        
+        if use_edge_keys:
+            edge_geom = {
+                (u, v, k): (data.get('geometry'), data.get('length'))
+                for u, v, k, data in G.edges(keys=True, data=True)
+            }
+        else:
+            edge_geom = shortest_parallel()
+        
         def get_edge_geom(u, v, key=None):
-            """Get edge geometry, with alignment"""
-            data = None
+            """Get edge geometry, with alignment, and the edge's length attribute (None if unset)"""
+            nonlocal shortest_geom
             if use_edge_keys and key is not None:
-                data = G.get_edge_data(u, v, key=key)
+                geom = edge_geom.get((u, v, key), missing)
+            elif use_edge_keys:
+                # Keyless items in a keyed circuit: shortest-edge lookup, built on first use
+                if shortest_geom is None:
+                    shortest_geom = shortest_parallel()
+                geom = shortest_geom.get((u, v), missing)
             else:
-                ed = G.get_edge_data(u, v)
-                if ed:
-                    # Pick the shortest edge if multiple exist
-                    if isinstance(ed, dict):
-                        data = min(ed.values(), key=lambda d: d.get('length', float('inf')))
-                    else:
-                        data = ed
+                geom = edge_geom.get((u, v), missing)
             
-            if not data:
+            if geom is missing:
                 # Fallback: straight line
                 logger.warning(f"No edge data for ({u}, {v}, key={key})")
-                return [list(u), list(v)]
+                return [list(u), list(v)], None
             
-            geom = data.get('geometry')
+            geom, length = geom
             if not geom:
-                return [list(u), list(v)]
+                return [list(u), list(v)], None
             
-            # Ensure geometry is aligned from u to v
-            seg = _align(u, v, [list(g) for g in geom])
-            # Force exact endpoints (belt-and-braces)
-            seg[0] = [u[0], u[1]]
-            seg[-1] = [v[0], v[1]]
-            return seg
-        
-        # Process each edge in the circuit
+            # Ensure geometry is aligned from u to v; _align copies the outer list
+            # once and only replaces the endpoints, so interior points are shared
+            return _align(u, v, geom), length
+        
+        # Pass 1: resolve every edge's geometry. The route length is accumulated
+        # from the edges' length attributes plus what bridging adds, so the
+        # assembled route is never walked again to measure it
+        segs = []
+        route_length = 0.0
         for idx, item in enumerate(circuit):
             if use_edge_keys:
                 u, v, k = item
-                seg = get_edge_geom(u, v, key=k)
+                seg, length = get_edge_geom(u, v, key=k)
             else:
                 u, v = item
-                seg = get_edge_geom(u, v, key=None)
+                seg, length = get_edge_geom(u, v, key=None)
             
             if not seg or len(seg) < 2:
                 logger.warning(f"Edge {idx} has invalid geometry, using straight line")
-                seg = [list(u), list(v)]
+                seg, length = [list(u), list(v)], None
             
-            # First segment - just add it
-            if not out:
-                out.extend(seg)
-                continue
-            
-            # Check continuity with previous segment
-            last_pt = out[-1]
+            if length is None:
+                length = geodesic_length(np.asarray(seg, dtype=np.float64))
+            route_length += length
+            segs.append(seg)
+        
+        # Gap ahead of each segment. Bridging never changes the last emitted point
+        # (always the previous segment's end), so all gaps are known up front
+        if len(segs) > 1:
+            ends = np.array(
+                [(prev[-1][0], prev[-1][1], seg[0][0], seg[0][1]) for prev, seg in zip(segs, segs[1:])],
+                dtype=np.float64
+            )
+            gaps = [0.0] + haversine_arr(ends[:, 0], ends[:, 1], ends[:, 2], ends[:, 3]).tolist()
+        else:
+            gaps = [0.0]
+        
+        # Pass 2: request every large-gap bridge concurrently, deduplicating repeated gaps
+        def gap_key(idx):
+            last_pt, first_pt = segs[idx - 1][-1], segs[idx][0]
+            return (round(last_pt[0], 6), round(last_pt[1], 6), round(first_pt[0], 6), round(first_pt[1], 6))
+        
+        requests = {}
+        for idx, gap in enumerate(gaps):
+            if gap > 20.0:
+                requests.setdefault(gap_key(idx), (segs[idx - 1][-1], segs[idx][0]))
+        
+        if requests:
+            logger.info(f"Bridging {len(requests)} distinct gaps with ORS concurrently")
+        results = await asyncio.gather(
+            *(self._cached_bridge(last_pt, first_pt, profile) for last_pt, first_pt in requests.values()),
+            return_exceptions=True
+        )
+        bridges = dict(zip(requests.keys(), results))
+        
+        # Pass 3: collect segment and bridge pieces in circuit order; the route is
+        # assembled from them in one pass at the end instead of extend per edge
+        pieces = [segs[0]]
+        for idx in range(1, len(segs)):
+            seg, gap = segs[idx], gaps[idx]
+            last_pt = segs[idx - 1][-1]
             first_pt = seg[0]
-            gap = self._haversine(tuple(last_pt), tuple(first_pt))
             
             # Log significant gaps for debugging
             if gap > 10.0:
@@ -516,56 +901,54 @@ class RouteConnector:
             # Handle gap based on size
             if gap <= 0.001:  # Essentially no gap (< 1mm)
                 # Just append segment without any duplicate
-                out.extend(seg[1:])
+                pieces.append(seg[1:])
                 
             elif gap <= 20.0:  # Small gap - direct join without ORS
                 logger.debug(f"Edge {idx}: Closing {gap:.2f}m gap with direct join")
-                # Insert the start point to bridge the gap
-                out.append(first_pt)
-                # Then append rest of segment
-                out.extend(seg[1:])
+                # The segment's start point bridges the gap
+                pieces.append(seg)
                 gaps_bridged += 1
                 total_gap_distance += gap
+                route_length += gap
                 
             else:  # Large gap > 20m - use ORS routing
                 logger.info(f"Edge {idx}: Bridging {gap:.1f}m gap with ORS")
-                try:
-                    if hasattr(self.ors_client, 'route_between_points'):
-                        bridge = await self.ors_client.route_between_points(
-                            last_pt, first_pt, profile=profile
-                        )
-                    else:
-                        bridge, _ = await self.ors_client.get_route(
-                            tuple(last_pt), tuple(first_pt), profile=profile
-                        )
+                bridge = bridges[gap_key(idx)]
+                
+                if isinstance(bridge, BaseException):
+                    logger.warning(f"Failed to bridge gap: {bridge}, using direct connection")
+                    pieces.append(seg)
+                    gaps_bridged += 1
+                    route_length += gap
                     
-                    if bridge and len(bridge) > 1:
-                        # snap ends to kill sub-meter drift
-                        bridge[0] = [last_pt[0], last_pt[1]]
-                        bridge[-1] = [first_pt[0], first_pt[1]]
-                        out.extend(bridge[1:])  # skip duplicate start
-                        # Now append the segment itself
-                        out.extend(seg[1:])
-                        gaps_bridged += 1
-                        total_gap_distance += gap
-                        logger.info(f"  Bridged with {len(bridge)} points")
-                    else:
-                        # fall back to direct connection
-                        logger.warning(f"  No route found, using direct connection")
-                        out.append(first_pt)
-                        out.extend(seg[1:])
-                        gaps_bridged += 1
-                        
-                except Exception as e:
-                    logger.warning(f"Failed to bridge gap: {e}, using direct connection")
-                    out.append(first_pt)
-                    out.extend(seg[1:])
+                elif bridge and len(bridge) > 1:
+                    # snap ends to kill sub-meter drift (copy - a bridge may be reused)
+                    bridge = list(bridge)
+                    bridge[0] = [last_pt[0], last_pt[1]]
+                    bridge[-1] = [first_pt[0], first_pt[1]]
+                    pieces.append(bridge[1:])  # skip duplicate start
+                    # Now append the segment itself
+                    pieces.append(seg[1:])
+                    gaps_bridged += 1
+                    total_gap_distance += gap
+                    route_length += geodesic_length(np.asarray(bridge, dtype=np.float64))
+                    logger.info(f"  Bridged with {len(bridge)} points")
+                else:
+                    # fall back to direct connection
+                    logger.warning(f"  No route found, using direct connection")
+                    pieces.append(seg)
                     gaps_bridged += 1
+                    route_length += gap
+        
+        out = list(chain.from_iterable(pieces))
         
         # Final continuity repair pass
         logger.info(f"Running final continuity repair... (main phase bridged {gaps_bridged} gaps)")
         fixes = await self._repair_continuity(out, profile)
         gaps_bridged += fixes
+        if fixes:
+            # Repairs splice bridges and move points; rare, so just measure the result
+            route_length = geodesic_length(np.asarray(out, dtype=np.float64))
         
         # Log validation results
         max_gap, violations = self.validate_route_continuity(out)
@@ -574,7 +957,7 @@ class RouteConnector:
         
         continuity_valid = violations == 0
         
-        return out
+        return out, route_length
     
     async def _repair_continuity(
         self,
@@ -582,49 +965,75 @@ class RouteConnector:
         profile: str
     ) -> int:
         """
-        Final pass: single-pass repair with loop-proof advancement
+        Final pass: find every gap in one vectorized pass, fetch their bridges
+        concurrently, then splice them in with loop-proof advancement
         """
         if not coords or len(coords) < 2:
             return 0
         
-        fixed = 0
-        i = 0
         MAX_FIXES = 200  # hard stop
         
-        while i < len(coords) - 1 and fixed < MAX_FIXES:
-            a, b = coords[i], coords[i+1]
-            gap = self._haversine(tuple(a), tuple(b))
+        gaps = segment_lengths(np.asarray(coords, dtype=np.float64))
+        bad = np.flatnonzero(gaps > 20.0)[:MAX_FIXES].tolist()  # Use same threshold as main phase
+        if not bad:
+            return 0
+        
+        # try routing once per gap, all gaps at once
+        results = dict(zip(bad, await asyncio.gather(
+            *(self._cached_bridge(coords[i], coords[i + 1], profile) for i in bad),
+            return_exceptions=True
+        )))
+        
+        fixed = 0
+        snapped = {}  # index -> replacement point after a fallback snap
+        spliced = {}  # index -> bridge replacing the edge from that index
+        pending = deque(bad)
+        
+        while pending and fixed < MAX_FIXES:
+            i = pending.popleft()
+            a, b = snapped.get(i, coords[i]), coords[i + 1]
             
-            if gap <= 20.0:  # Use same threshold as main phase
-                i += 1
-                continue
+            if i in snapped:
+                # The previous fallback moved this gap's start, so it changed
+                gap = haversine(a[0], a[1], b[0], b[1])
+                if gap <= 20.0:
+                    continue
+                try:
+                    bridge = await self._cached_bridge(a, b, profile)
+                except Exception as e:
+                    bridge = e
+            else:
+                gap = float(gaps[i])
+                bridge = results[i]
             
-            # try routing once
             logger.warning(f"Final repair: Found {gap:.1f}m gap at index {i}")
-            try:
-                if hasattr(self.ors_client, 'route_between_points'):
-                    bridge = await self.ors_client.route_between_points(
-                        a, b, profile=profile
-                    )
-                else:
-                    bridge, _ = await self.ors_client.get_route(
-                        tuple(a), tuple(b), profile=profile
-                    )
-                
-                if bridge and len(bridge) > 1:
-                    bridge[0] = [a[0], a[1]]
-                    bridge[-1] = [b[0], b[1]]
-                    coords[i:i+2] = bridge  # replace exactly the gap edge
-                    fixed += 1
-                    i += max(1, len(bridge) - 1)  # advance past inserted polyline
-                    continue
-            except Exception as e:
-                logger.error(f"Final repair routing failed: {e}")
+            if isinstance(bridge, BaseException):
+                logger.error(f"Final repair routing failed: {bridge}")
+            elif bridge and len(bridge) > 1:
+                bridge[0] = [a[0], a[1]]
+                bridge[-1] = [b[0], b[1]]
+                spliced[i] = bridge  # replaces exactly the gap edge
+                fixed += 1
+                continue
             
             # fallback: snap b to a (guarantee progress)
-            coords[i+1] = [a[0], a[1]]
+            snapped[i + 1] = [a[0], a[1]]
             fixed += 1
-            i += 1
+            if i + 2 < len(coords) and (not pending or pending[0] != i + 1):
+                pending.appendleft(i + 1)
+        
+        # Rebuild once, in order; each bridge replaces its start point and runs up to the next one
+        for i, point in snapped.items():
+            coords[i] = point
+        if spliced:
+            repaired = []
+            start = 0
+            for i in sorted(spliced):
+                repaired.extend(coords[start:i])
+                repaired.extend(spliced[i][:-1])
+                start = i + 1
+            repaired.extend(coords[start:])
+            coords[:] = repaired
         
         if fixed >= MAX_FIXES:
             logger.error(f"Final repair aborted after {fixed} fixes (hit limit)")
@@ -650,24 +1059,22 @@ class RouteConnector:
         """
         
         max_gap_threshold = max_gap or 12.0  # Same as main phase threshold
-        max_gap_found = 0.0
-        violations = 0
         
-        for i in range(len(coords) - 1):
-            p1 = tuple(coords[i])
-            p2 = tuple(coords[i + 1])
-            
-            distance = self._haversine(p1, p2)
-            max_gap_found = max(max_gap_found, distance)
-            
-            if distance > max_gap_threshold:
-                violations += 1
-                if violations <= 5:  # Log first few violations
-                    logger.warning(f"  Gap at index {i}: {distance:.1f}m")
+        # One vectorized haversine pass over all consecutive pairs
+        arr = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+        gaps = segment_lengths(arr)
         
-        is_valid = violations == 0
+        max_gap_found = float(gaps.max()) if gaps.size else 0.0
+        violation_idx = np.nonzero(gaps > max_gap_threshold)[0]
+        violations = int(violation_idx.size)
         
         if violations > 0:
+            # Log the largest few violations, in route order
+            worst = violation_idx
+            if violations > 5:
+                worst = np.sort(violation_idx[np.argpartition(gaps[violation_idx], -5)[-5:]])
+            for i in worst.tolist():
+                logger.warning(f"  Gap at index {i}: {gaps[i]:.1f}m")
             logger.warning(f"Found {violations} continuity violations (max gap: {max_gap_found:.1f}m)")
         
         return max_gap_found, violations
\ No newline at end of file
@@ -6,16 +6,23 @@ Last updated: 2025-08-21
 """
 
 import asyncio
+import json
 import logging
 import os
-import sys
+import time
 import traceback
+import zlib
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import lru_cache
 
-from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Optional
-from pydantic import BaseModel
+import numpy as np
+import shapely
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
+from typing import List, Optional
+from pydantic import BaseModel, ConfigDict, Field
 
 # Configure basic logging first
 logging.basicConfig(
@@ -24,10 +31,30 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+
+@dataclass(frozen=True, slots=True)
+class EnvSnapshot:
+    """Raw environment facts reported by /health and /diagnostics, read once at import"""
+    port: int
+    has_db_url: bool
+    has_ors_env: bool
+    ors_env_len: int
+    worker_mode: str
+
+
+ENV = EnvSnapshot(
+    port=int(os.environ.get("PORT", 8080)),
+    has_db_url="DATABASE_URL" in os.environ,
+    has_ors_env="ORS_API_KEY" in os.environ,
+    ors_env_len=len(os.environ.get("ORS_API_KEY", "")),
+    worker_mode=os.environ.get("WORKER_MODE", "")
+)
+
+
 # Log startup
 logger.info("Starting ScanNeo Worker Service...")
-logger.info(f"Port: {os.environ.get('PORT', '8080')}")
-logger.info(f"Database URL configured: {'DATABASE_URL' in os.environ}")
+logger.info(f"Port: {ENV.port}")
+logger.info(f"Database URL configured: {ENV.has_db_url}")
 
 # Global error tracking
 startup_error = None
@@ -35,7 +62,15 @@ startup_error = None
 try:
     from app.config import settings
     from app.database import db
-    from app.services import JobProcessor
+    
+    # Health-only replicas skip the service import tree (OSM, routing, ORS)
+    if ENV.worker_mode != "health_only":
+        from app.services import JobProcessor
+        from app.services.job_batcher import JobBatcher
+    else:
+        JobProcessor = None
+        JobBatcher = None
+        logger.info("WORKER_MODE=health_only - job processing disabled")
     
     # Update logging level from settings
     logging.getLogger().setLevel(getattr(logging, settings.log_level))
@@ -45,19 +80,91 @@ try:
 except Exception as e:
     logger.error(f"Failed to load configuration: {e}")
     logger.error(f"Error type: {type(e).__name__}")
-    import traceback
     error_traceback = traceback.format_exc()
     logger.error(f"Traceback: {error_traceback}")
     logger.error("Worker will run in degraded mode (health check only)")
     settings = None
     db = None
     JobProcessor = None
+    JobBatcher = None
     # Store error for debugging
     startup_error = str(e)
 
 # Job processor instance
 job_processor = JobProcessor() if JobProcessor else None
 
+# Coalesces concurrent manual submissions into process_jobs batches
+job_batcher = JobBatcher(job_processor.process_jobs) if job_processor else None
+
+# Database health, refreshed in the background so probes never touch the pool
+HEALTH_REFRESH_S = 5.0
+HEALTH_STALE_S = 3 * HEALTH_REFRESH_S
+_health_cache = {"ts": 0.0, "healthy": False}
+
+
+async def _db_health() -> bool:
+    """Database health check without blocking the event loop (psycopg2 is sync)"""
+    return await asyncio.get_running_loop().run_in_executor(None, db.health_check)
+
+
+async def _health_refresher():
+    """Probe the database every HEALTH_REFRESH_S seconds into _health_cache"""
+    while True:
+        try:
+            _health_cache["healthy"] = await _db_health()
+        except Exception as e:
+            logger.error(f"Health refresh failed: {e}")
+            _health_cache["healthy"] = False
+        _health_cache["ts"] = time.monotonic()
+        await asyncio.sleep(HEALTH_REFRESH_S)
+
+
+# Supervised background tasks: referenced until done, failures logged
+BG_SHUTDOWN_GRACE_S = 10.0
+_bg_tasks = set()
+_bg_slots: Optional[asyncio.Semaphore] = None
+
+
+def _log_and_discard(task: asyncio.Task):
+    """Done callback: drop the task reference and log how it ended"""
+    _bg_tasks.discard(task)
+    if task.cancelled():
+        return
+    error = task.exception()
+    if error:
+        logger.error(
+            f"Background task {task.get_name()} failed: {error}",
+            exc_info=(type(error), error, error.__traceback__)
+        )
+
+
+async def _supervised(coro):
+    """Run coro inside one of the max_bg_jobs slots"""
+    async with _bg_slots:
+        return await coro
+
+
+def _spawn(coro, name: str, service: bool = False) -> asyncio.Task:
+    """
+    Start a supervised background task. Finite jobs share the max_bg_jobs
+    slots; long-lived services (loops that run until shutdown) would hold a
+    slot forever, so they bypass them.
+    """
+    task = asyncio.create_task(coro if service else _supervised(coro), name=name)
+    _bg_tasks.add(task)
+    task.add_done_callback(_log_and_discard)
+    return task
+
+
+async def _close_bg_tasks():
+    """Give background tasks BG_SHUTDOWN_GRACE_S to finish, then cancel the rest"""
+    if not _bg_tasks:
+        return
+    _, pending = await asyncio.wait(set(_bg_tasks), timeout=BG_SHUTDOWN_GRACE_S)
+    for task in pending:
+        task.cancel()
+    await asyncio.gather(*pending, return_exceptions=True)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -68,9 +175,21 @@ async def lifespan(app: FastAPI):
     else:
         logger.info("Starting ScanNeo Worker in degraded mode")
     
+    global _bg_slots
+    _bg_slots = asyncio.Semaphore(settings.max_bg_jobs if settings else 8)
+    
+    # One ORS client (and connection pool) for every request, shared with the
+    # processor when there is one; closed on shutdown
+    app.state.ors = job_processor.ors_client if job_processor else None
+    
+    # Keep the database health cache warm
+    health_task = _spawn(_health_refresher(), "health-refresher", service=True) if db else None
+    
     # Start job processor in background if available
+    batcher_task = None
     if job_processor:
-        asyncio.create_task(job_processor.start())
+        _spawn(job_processor.start(), "job-processor", service=True)
+        batcher_task = _spawn(job_batcher.run(), "job-batcher", service=True)
         logger.info("Job processor started")
     else:
         logger.warning("Job processor not available - running in health check only mode")
@@ -79,8 +198,92 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down worker service")
+    if health_task:
+        health_task.cancel()
+    if batcher_task:
+        batcher_task.cancel()
     if job_processor:
+        # stop() ends the polling loop; let an in-flight job drain before cancelling
         await job_processor.stop()
+    await _close_bg_tasks()
+    if app.state.ors:
+        await app.state.ors.close()
+    if db:
+        db.close_pool()
+
+
+GZIP_MIN_RESPONSE_BYTES = 1024  # smaller responses aren't worth compressing
+
+
+MAX_INFLATED_BODY_BYTES = 64 * 1024 * 1024  # cap on a gzip request body once inflated
+
+
+class _BodyRejected(HTTPException):
+    """
+    Raised from GzipRequestMiddleware's receive. An HTTPException, so body
+    parsing passes it through unwrapped; the middleware answers it itself
+    if it gets that far.
+    """
+
+
+class GzipRequestMiddleware:
+    """
+    Inflate Content-Encoding: gzip request bodies as they stream in, up to
+    MAX_INFLATED_BODY_BYTES. Oversized bodies get a 413 and corrupt ones a
+    400, sent from here since nothing downstream handles errors in receive.
+    """
+    
+    def __init__(self, app, max_bytes: int = MAX_INFLATED_BODY_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        
+        headers = [(k, v) for k, v in scope['headers'] if k != b'content-length']
+        encoding = dict(headers).get(b'content-encoding', b'').lower()
+        if encoding != b'gzip':
+            return await self.app(scope, receive, send)
+        
+        # Downstream sees a plain body of unknown length
+        scope = {**scope, 'headers': [(k, v) for k, v in headers if k != b'content-encoding']}
+        inflater = zlib.decompressobj(wbits=31)
+        inflated = 0
+        started = False
+        
+        async def inflated_receive():
+            nonlocal inflated
+            message = await receive()
+            if message['type'] == 'http.request':
+                budget = self.max_bytes - inflated
+                try:
+                    # One byte past the budget is enough to tell it was exceeded
+                    body = inflater.decompress(message.get('body', b''), budget + 1)
+                    if len(body) <= budget and not message.get('more_body', False):
+                        body += inflater.flush()
+                        if not inflater.eof:
+                            raise _BodyRejected(400, "Invalid gzip body: truncated stream")
+                except zlib.error as e:
+                    raise _BodyRejected(400, f"Invalid gzip body: {e}")
+                inflated += len(body)
+                if inflated > self.max_bytes:
+                    raise _BodyRejected(413, f"Request body exceeds {self.max_bytes} bytes once inflated")
+                message = {**message, 'body': body}
+            return message
+        
+        async def tracked_send(message):
+            nonlocal started
+            started = started or message['type'] == 'http.response.start'
+            await send(message)
+        
+        try:
+            await self.app(scope, inflated_receive, tracked_send)
+        except _BodyRejected as e:
+            if started:
+                raise
+            response = JSONResponse({"detail": e.detail}, status_code=e.status_code)
+            await response(scope, receive, send)
 
 
 # Initialize FastAPI app
@@ -90,10 +293,21 @@ app = FastAPI(
     version="1.0.4-debug" if not settings else settings.service_version,
     lifespan=lifespan
 )
+app.add_middleware(GzipRequestMiddleware)
+app.add_middleware(GZipMiddleware, minimum_size=GZIP_MIN_RESPONSE_BYTES)
+
+
+MAX_ROUTE_BATCH = 16  # routes computed per /api/generate-route/batch request
+GEOJSON_SEQ_TYPE = 'application/geo+json-seq'  # RFC 8142, one feature per record
+WKB_TYPE = 'application/vnd.geo+wkb'  # route geometry as raw WKB bytes
+ROUTE_SUMMARY_HEADER = 'X-Route-Summary'  # compact JSON metadata sent alongside WKB
 
 
-# Request/Response models
+# Request/Response models: immutable. Requests ignore unknown fields (the pre-existing
+# behaviour callers rely on); our own responses reject them
 class HealthResponse(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='forbid')
+    
     status: str
     service: str
     version: str
@@ -105,22 +319,40 @@ class HealthResponse(BaseModel):
 
 
 class ManualJobRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
     area_id: str
     profile: str = "driving-car"
     chunk_duration: int = 3600
 
 
-@app.get("/", response_model=HealthResponse)
+class ManualJobBatchRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
+    jobs: List[ManualJobRequest]
+
+
+class RouteBatchRequest(BaseModel):
+    model_config = ConfigDict(frozen=True, extra='ignore')
+    
+    jobs: List[dict] = Field(..., max_length=MAX_ROUTE_BATCH)  # generate-route request bodies
+
+
+@app.get("/")
 async def root():
-    """Root endpoint - health check"""
-    return await health()
+    """Root endpoint - liveness ping, no I/O (use /health for readiness)"""
+    return {"status": "ok", "service": "scanneo-worker"}
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health():
     """Health check endpoint"""
-    # Check database health if available
-    db_healthy = db.health_check() if db else False
+    # Database health from the background probe; a stale result counts as unhealthy
+    db_healthy = bool(
+        db
+        and _health_cache["healthy"]
+        and time.monotonic() - _health_cache["ts"] < HEALTH_STALE_S
+    )
     
     # Determine overall status
     if not settings or not db:
@@ -136,35 +368,31 @@ async def health():
         "version": settings.service_version if settings else "1.0.3",
         "database": db_healthy,
         "environment": settings.environment if settings else "unknown",
-        "has_database_url": "DATABASE_URL" in os.environ,
+        "has_database_url": ENV.has_db_url,
         "config_loaded": settings is not None,
         "error": startup_error if 'startup_error' in globals() else None
     }
 
 
-@app.get("/diagnostics")
-async def diagnostics():
-    """Get diagnostic information about the service configuration"""
+@lru_cache(maxsize=1)
+def _static_diagnostics(version: str, environment: str) -> dict:
+    """Configuration part of /diagnostics; it only changes with the deployed config"""
     # Check if the key exactly matches what we expect
     expected_key_start = "eyJvcmci"
     actual_key = settings.ors_api_key if settings else ""
     
-    diag_info = {
+    return {
         "service": "scanneo-worker",
-        "version": settings.service_version if settings else "unknown",
-        "environment": settings.environment if settings else "unknown",
-        "database": {
-            "configured": "DATABASE_URL" in os.environ,
-            "connected": db.health_check() if db else False
-        },
+        "version": version,
+        "environment": environment,
         "ors": {
             "configured": bool(settings and settings.ors_api_key),
             "key_length": len(actual_key),
             "key_prefix": actual_key[:8] + "..." if len(actual_key) > 8 else "not_set",
             "starts_correctly": actual_key.startswith(expected_key_start) if actual_key else False,
             "has_equals": actual_key.endswith("=") if actual_key else False,
-            "raw_env_present": "ORS_API_KEY" in os.environ,
-            "raw_env_length": len(os.environ.get("ORS_API_KEY", ""))
+            "raw_env_present": ENV.has_ors_env,
+            "raw_env_length": ENV.ors_env_len
         },
         "config": {
             "poll_interval": settings.poll_interval if settings else None,
@@ -172,17 +400,40 @@ async def diagnostics():
             "max_gap_meters": settings.max_gap_meters if settings else None
         }
     }
+
+
+@app.get("/diagnostics")
+async def diagnostics():
+    """Get diagnostic information about the service configuration"""
+    db_connected = await _db_health() if db else False
+    
+    # Shallow copy: the cached nested dicts are shared, "database" is per call
+    diag_info = dict(_static_diagnostics(
+        settings.service_version if settings else "unknown",
+        settings.environment if settings else "unknown"
+    ))
+    diag_info["database"] = {
+        "configured": ENV.has_db_url,
+        "connected": db_connected
+    }
     
     return JSONResponse(content=diag_info)
 
 
+def _shared_ors():
+    """The app-scoped ORS client, created on first use when there is no processor"""
+    ors = getattr(app.state, 'ors', None)
+    if ors is None:
+        from app.services.ors_client import ORSClient
+        
+        ors = app.state.ors = ORSClient()
+    return ors
+
+
 @app.get("/test-ors")
 async def test_ors():
     """Test ORS routing directly"""
-    from app.services.ors_client import ORSClient
-    
-    # Create a fresh ORS client
-    ors = ORSClient()
+    ors = _shared_ors()
     
     # Test coordinates (same area as your test)
     start = (-1.06, 50.80)
@@ -190,18 +441,19 @@ async def test_ors():
     
     try:
         # Try to get a route
-        coords, distance = await ors.get_route(start, end)
+        # Always live: this is a connectivity check, a cached result would hide an outage
+        probe = await ors.probe_route(start, end)
         
         return {
             "success": True,
             "ors_enabled": ors.enabled,
             "api_key_present": bool(ors.api_key),
             "api_key_length": len(ors.api_key) if ors.api_key else 0,
-            "route_points": len(coords),
-            "distance_m": distance,
-            "used_ors": getattr(ors, 'last_success', False),
-            "used_fallback": len(coords) == 2 and distance < 1400,  # Haversine distance is ~1315m
-            "last_error": getattr(ors, 'last_error', None)
+            "route_points": len(probe.coords),
+            "distance_m": probe.distance,
+            "used_ors": probe.used_ors,
+            "used_fallback": probe.used_fallback,
+            "last_error": probe.last_error
         }
     except Exception as e:
         return {
@@ -210,64 +462,181 @@ async def test_ors():
             "ors_enabled": ors.enabled,
             "api_key_present": bool(ors.api_key),
             "api_key_length": len(ors.api_key) if ors.api_key else 0,
-            "last_error": getattr(ors, 'last_error', None)
+            "last_error": ors.last_error
+        }
+
+
+async def _calculate_route(body: dict) -> dict:
+    """Run the route calculator for one generate-route request body"""
+    from app.services.route_calculator import RouteCalculator
+    
+    # Extract parameters from request
+    streets_geojson = body.get('streets_geojson')
+    start_point = body.get('start_point')
+    coverage_mode = body.get('coverage_mode', True)
+    
+    if not streets_geojson:
+        raise HTTPException(status_code=400, detail="streets_geojson is required")
+    
+    logger.info(f"Generating route for {len(streets_geojson.get('features', []))} streets")
+    
+    # Initialize route calculator with coverage mode; ORS calls share the app's pooled client
+    calculator = RouteCalculator(ors_client=_shared_ors(), coverage_mode=coverage_mode)
+    
+    # Calculate the route using Chinese Postman algorithm
+    result = await calculator.calculate_route(
+        streets_geojson=streets_geojson,
+        profile='driving-car'
+    )
+    
+    logger.info(f"Route generated successfully with {len(result.get('gaps', []))} gaps")
+    return result
+
+
+def _route_coords(result: dict) -> np.ndarray:
+    """Route coordinates as an (N, 2) float64 array"""
+    coords = result.get('_coords')
+    if coords is None:
+        coords = result['geometry']['coordinates']
+    return np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+
+
+def _route_summary(result: dict) -> dict:
+    """Counts and totals for a calculated route, without its geometry"""
+    return {
+        "coord_count": len(_route_coords(result)),
+        "gap_count": len(result.get('gaps', [])),
+        "length_m": result.get('length_m'),
+        "drive_time_s": result.get('drive_time_s')
+    }
+
+
+def _route_wkb(result: dict) -> bytes:
+    """Route geometry as a little-endian 2D WKB LineString (empty if under two points)"""
+    coords = _route_coords(result)
+    line = shapely.linestrings(coords) if len(coords) >= 2 else shapely.LineString()
+    return shapely.to_wkb(line, output_dimension=2, byte_order=1)
+
+
+async def _generate_route(body: dict, summary: bool = False) -> dict:
+    """
+    Compute one coverage route from a generate-route request body. With
+    summary, the route is reported as counts and totals without geometry.
+    """
+    result = await _calculate_route(body)
+    
+    if summary:
+        return {"success": True, "route": _route_summary(result)}
+    
+    # Format response for frontend
+    return {
+        "success": True,
+        "route": {
+            "geometry": result.get('geometry'),
+            "gaps": result.get('gaps', []),
+            "statistics": result.get('statistics', {}),
+            "diagnostics": result.get('diagnostics', {})
         }
+    }
+
+
+def _seq_feature(record: bytes) -> dict:
+    """One GeoJSON text sequence record: optional RS prefix, JSON text"""
+    try:
+        return json.loads(record.lstrip(b'\x1e'))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid GeoJSON sequence record: {e}")
+
+
+async def _read_generate_body(request: Request) -> dict:
+    """
+    generate-route body: a JSON object, or a GeoJSON text sequence (RFC 8142)
+    of street features with coverage_mode in the query string. Sequences are
+    parsed record by record as the body streams in.
+    """
+    content_type = request.headers.get('content-type', '').split(';')[0].strip().lower()
+    
+    if content_type != GEOJSON_SEQ_TYPE:
+        try:
+            body = await request.json()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {e}")
+        if not isinstance(body, dict):
+            raise HTTPException(status_code=400, detail="Request body must be a JSON object")
+        return body
+    
+    features = []
+    pending = b''
+    async for chunk in request.stream():
+        *records, pending = (pending + chunk).split(b'\n')
+        features.extend(_seq_feature(r) for r in records if r.strip(b'\x1e \t\r'))
+    if pending.strip(b'\x1e \t\r'):
+        features.append(_seq_feature(pending))
+    
+    coverage_mode = request.query_params.get('coverage_mode', 'true').lower() not in ('false', '0', 'no')
+    return {
+        'streets_geojson': {'type': 'FeatureCollection', 'features': features},
+        'coverage_mode': coverage_mode
+    }
 
 
 @app.post("/api/generate-route")
-async def generate_route(request: dict):
+async def generate_route(request: Request, summary: bool = False, geometry_format: str = 'geojson'):
     """
     Generate a coverage route using Chinese Postman algorithm
-    Called directly from the frontend
+    Called directly from the frontend; also accepts application/geo+json-seq.
+    ?summary=1 returns coord/gap counts and totals instead of the geometry.
+    ?geometry_format=wkb returns the route as WKB bytes, with the summary
+    as JSON in the X-Route-Summary header.
     """
+    if geometry_format not in ('geojson', 'wkb'):
+        raise HTTPException(status_code=400, detail=f"Unsupported geometry_format: {geometry_format}")
+    body = await _read_generate_body(request)
+    
     try:
-        from app.services.route_calculator import RouteCalculator
-        
-        # Extract parameters from request
-        streets_geojson = request.get('streets_geojson')
-        start_point = request.get('start_point')
-        coverage_mode = request.get('coverage_mode', True)
-        
-        if not streets_geojson:
-            raise HTTPException(status_code=400, detail="streets_geojson is required")
-        
-        logger.info(f"Generating route for {len(streets_geojson.get('features', []))} streets")
-        
-        # Initialize route calculator with coverage mode
-        calculator = RouteCalculator(coverage_mode=coverage_mode)
-        
-        # Calculate the route using Chinese Postman algorithm
-        result = await calculator.calculate_route(
-            streets_geojson=streets_geojson,
-            profile='driving-car'
-        )
-        
-        # Format response for frontend
-        response = {
-            "success": True,
-            "route": {
-                "geometry": result.get('geometry'),
-                "gaps": result.get('gaps', []),
-                "statistics": result.get('statistics', {}),
-                "diagnostics": result.get('diagnostics', {})
-            }
-        }
-        
-        logger.info(f"Route generated successfully with {len(result.get('gaps', []))} gaps")
-        return response
+        if geometry_format == 'wkb':
+            result = await _calculate_route(body)
+            return Response(
+                content=_route_wkb(result),
+                media_type=WKB_TYPE,
+                headers={ROUTE_SUMMARY_HEADER: json.dumps(_route_summary(result), separators=(',', ':'))}
+            )
+        return await _generate_route(body, summary)
         
     except Exception as e:
         logger.error(f"Route generation failed: {e}")
-        import traceback
         logger.error(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/process/manual")
-async def trigger_manual_job(request: ManualJobRequest):
+
+@app.post("/api/generate-route/batch")
+async def generate_routes(request: RouteBatchRequest, summary: bool = False):
     """
-    Manually trigger job processing (for testing)
-    Only available in development environment
+    Generate several coverage routes in one request
+    Jobs run concurrently and are reported separately; one failing job does not fail the others
     """
+    outcomes = await asyncio.gather(
+        *(_generate_route(job, summary) for job in request.jobs),
+        return_exceptions=True
+    )
+    
+    results = []
+    for i, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Route generation failed for batch job {i}: {outcome}")
+            error = outcome.detail if isinstance(outcome, HTTPException) else str(outcome)
+            results.append({"success": False, "error": error})
+        else:
+            results.append(outcome)
+    
+    return {
+        "success": all(r["success"] for r in results),
+        "results": results
+    }
+
+
+def _check_manual_allowed():
+    """Manual job endpoints need a configured processor and a non-production environment"""
     if not settings or not job_processor:
         raise HTTPException(
             status_code=503,
@@ -279,21 +648,35 @@ async def trigger_manual_job(request: ManualJobRequest):
             status_code=403,
             detail="Manual job triggering not allowed in production"
         )
+
+
+def _manual_job(request: ManualJobRequest) -> dict:
+    """Build a mock job from a manual request"""
+    return {
+        'id': f'manual_{request.area_id}',
+        'area_id': request.area_id,
+        'profile': request.profile,
+        'params': {
+            'chunkDuration': request.chunk_duration,
+            'manual': True
+        }
+    }
+
+
+@app.post("/process/manual")
+async def trigger_manual_job(request: ManualJobRequest):
+    """
+    Manually trigger job processing (for testing)
+    Only available in development environment
+    """
+    _check_manual_allowed()
     
     try:
-        # Create a mock job
-        job = {
-            'id': f'manual_{request.area_id}',
-            'area_id': request.area_id,
-            'profile': request.profile,
-            'params': {
-                'chunkDuration': request.chunk_duration,
-                'manual': True
-            }
-        }
+        job = _manual_job(request)
         
-        # Process immediately
-        await job_processor.process_job(job)
+        # Concurrent submissions are processed together by the batcher
+        fut = await job_batcher.submit(job)
+        await fut
         
         return {
             "success": True,
@@ -309,6 +692,32 @@ async def trigger_manual_job(request: ManualJobRequest):
         )
 
 
+@app.post("/process/manual/batch")
+async def trigger_manual_jobs(request: ManualJobBatchRequest):
+    """
+    Manually trigger processing of several jobs in one request (for testing)
+    Reports each job separately; one failing job does not fail the others
+    """
+    _check_manual_allowed()
+    
+    jobs = [_manual_job(r) for r in request.jobs]
+    futures = [await job_batcher.submit(job) for job in jobs]
+    outcomes = await asyncio.gather(*futures, return_exceptions=True)
+    
+    results = []
+    for job, outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error(f"Manual job {job['id']} failed: {outcome}")
+            results.append({"job_id": job['id'], "success": False, "error": str(outcome)})
+        else:
+            results.append({"job_id": job['id'], "success": True})
+    
+    return {
+        "success": all(r["success"] for r in results),
+        "results": results
+    }
+
+
 @app.get("/status")
 async def status():
     """Get worker status and statistics"""
@@ -320,33 +729,49 @@ async def status():
     }
 
 
-@app.get("/debug/pending-jobs")
-async def debug_pending_jobs():
-    """Debug endpoint to check for pending jobs"""
-    if not db:
-        return {"error": "Database not configured"}
-    
-    try:
-        # Get count of all jobs using direct database connection
-        job_counts = []
-        with db.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
+# Pending jobs listed by /debug/pending-jobs; the SQL LIMIT bounds what is fetched
+DEBUG_PENDING_LIMIT = 5
+
+
+def _fetch_job_counts():
+    """Job counts by status and the oldest pending jobs (sync, for run_in_executor)"""
+    with db.get_connection() as conn:
+        with conn.cursor() as cur:
+            # Both result sets in one round-trip, aggregated to JSON
+            cur.execute("""
+                WITH counts AS (
                     SELECT status, COUNT(*) as count 
                     FROM coverage_routes 
                     GROUP BY status
-                """)
-                job_counts = [dict(row) for row in cur.fetchall()]
-                
-                # Also check for pending jobs directly
-                cur.execute("""
+                ),
+                pending AS (
                     SELECT id, area_id, status, created_at 
                     FROM coverage_routes 
                     WHERE status IN ('pending', 'queued')
                     ORDER BY created_at ASC
-                    LIMIT 5
-                """)
-                pending_jobs = [dict(row) for row in cur.fetchall()]
+                    LIMIT %s
+                )
+                SELECT
+                    (SELECT jsonb_agg(counts) FROM counts) AS job_counts,
+                    (SELECT jsonb_agg(pending ORDER BY created_at) FROM pending) AS pending_jobs
+            """, (DEBUG_PENDING_LIMIT,))
+            row = cur.fetchone()
+    
+    # jsonb_agg over no rows is NULL
+    return row['job_counts'] or [], row['pending_jobs'] or []
+
+
+@app.get("/debug/pending-jobs")
+async def debug_pending_jobs():
+    """Debug endpoint to check for pending jobs"""
+    if not db:
+        return {"error": "Database not configured"}
+    
+    try:
+        # Blocking psycopg2 queries run in the default executor
+        job_counts, pending_jobs = await asyncio.get_running_loop().run_in_executor(
+            None, _fetch_job_counts
+        )
         
         return {
             "pending_jobs": pending_jobs,
@@ -365,10 +790,16 @@ async def debug_pending_jobs():
 if __name__ == "__main__":
     import uvicorn
     
+    # The job processor polls from every process, so keep one worker per
+    # replica unless WEB_CONCURRENCY says otherwise; async I/O covers concurrency
     uvicorn.run(
         "main:app",
         host="0.0.0.0",
-        port=8000,  # Changed to 8000 for local development
+        port=int(os.environ.get("PORT", 8000)),  # 8000 for local development
+        uds=os.environ.get("WORKER_UDS") or None,  # Unix socket instead of TCP, for co-located clients
+        workers=int(os.environ.get("WEB_CONCURRENCY", 1)),
+        limit_concurrency=int(os.environ.get("UVICORN_LIMIT_CONCURRENCY", 200)),
+        backlog=int(os.environ.get("UVICORN_BACKLOG", 2048)),
         reload=settings.environment == "development" if settings else False,
         log_level=settings.log_level.lower() if settings else "info"
-    )
\ No newline at end of file
+    )
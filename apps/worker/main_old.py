@@ -4,21 +4,17 @@ Processes coverage jobs and generates navigable routes
 """
 
 import os
-import json
 import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Optional
 from datetime import datetime
 
 from fastapi import FastAPI, HTTPException
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 import psycopg2
-from psycopg2.extras import RealDictCursor
-from redis import Redis
+from psycopg2.pool import ThreadedConnectionPool
 from dotenv import load_dotenv
-import requests
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 # Load environment variables
 load_dotenv()
@@ -53,9 +49,11 @@ if REDIS_URL and REDIS_TOKEN:
     except Exception as e:
         logger.error(f"Failed to initialize Redis: {e}")
 
-# Database connection pool
+# Database connection pool, created on startup
+db_pool: Optional[ThreadedConnectionPool] = None
+
 def get_db_connection():
-    """Create a database connection"""
+    """Create a standalone database connection (admin scripts; endpoints use db_pool)"""
     try:
         conn = psycopg2.connect(DATABASE_URL)
         return conn
@@ -63,6 +61,24 @@ def get_db_connection():
         logger.error(f"Database connection failed: {e}")
         raise
 
+def _query_one(sql: str, cursor_factory=None):
+    """Run a query on a pooled connection and return the first row (blocking)"""
+    conn = db_pool.getconn()
+    try:
+        with conn.cursor(cursor_factory=cursor_factory) as cur:
+            cur.execute(sql)
+            return cur.fetchone()
+    finally:
+        conn.rollback()
+        db_pool.putconn(conn)
+
+async def query_one(sql: str, cursor_factory=None):
+    """Run _query_one in the default executor so the event loop keeps serving"""
+    if db_pool is None:
+        raise RuntimeError("Database pool not initialized")
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _query_one, sql, cursor_factory)
+
 # Pydantic models
 class JobStatus(BaseModel):
     job_id: str
@@ -100,12 +116,14 @@ async def startup_event():
     """Initialize background tasks on startup"""
     logger.info("Worker service starting up")
     
-    # Test database connection
+    global db_pool
+    
+    # Create the pool and test the database connection
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT 1")
-        conn.close()
+        db_pool = await asyncio.get_running_loop().run_in_executor(
+            None, ThreadedConnectionPool, 2, 10, DATABASE_URL
+        )
+        await query_one("SELECT 1")
         logger.info("Database connection successful")
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
@@ -113,6 +131,12 @@ async def startup_event():
     # Start background job processor
     asyncio.create_task(process_jobs())
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Close pooled database connections"""
+    if db_pool:
+        db_pool.closeall()
+
 @app.get("/health", response_model=HealthCheck)
 async def health_check():
     """Health check endpoint"""
@@ -120,10 +144,7 @@ async def health_check():
     # Check database
     db_healthy = False
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT 1")
-        conn.close()
+        await query_one("SELECT 1")
         db_healthy = True
     except:
         pass
@@ -159,11 +180,9 @@ async def test_processing():
     
     # Test database connection
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT COUNT(*) as count FROM areas")
-        result = cur.fetchone()
-        conn.close()
+        from psycopg2.extras import RealDictCursor
+        
+        result = await query_one("SELECT COUNT(*) as count FROM areas", RealDictCursor)
         
         return JSONResponse({
             "status": "success",
@@ -209,4 +228,10 @@ class CoverageProcessor:
 if __name__ == "__main__":
     import uvicorn
     port = int(os.getenv("WORKER_PORT", 8080))
-    uvicorn.run(app, host="0.0.0.0", port=port)
\ No newline at end of file
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=port,
+        limit_concurrency=int(os.getenv("UVICORN_LIMIT_CONCURRENCY", 200)),
+        backlog=int(os.getenv("UVICORN_BACKLOG", 2048))
+    )
@@ -1,79 +1,93 @@
 #!/usr/bin/env python3
 """
 Test database connection and job polling
+
+Run with pytest (or directly); settings and the database pool are set up
+once per session and shared by every check. Settings read .env themselves.
 """
 
-import os
 import sys
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+import pytest
 
-# Add app to path
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-def test_connection():
-    """Test database connection and basic operations"""
-    print("Testing ScanNeo Worker...")
-    
-    # Test config loading
+@pytest.fixture(scope="session")
+def settings_fx():
+    """Loaded settings, or skip everything if config can't load"""
     try:
         from app.config import settings
-        print(f"✓ Config loaded: {settings.service_name} v{settings.service_version}")
-        print(f"  Environment: {settings.environment}")
-        print(f"  Database URL: {settings.database_url[:30]}...")
     except Exception as e:
-        print(f"✗ Failed to load config: {e}")
-        return False
-    
-    # Test database connection
+        pytest.skip(f"Failed to load config: {e}")
+    return settings
+
+
+@pytest.fixture(scope="session")
+def db_fx(settings_fx):
+    """Database pool, or skip the database checks if it can't connect"""
     try:
         from app.database import db
-        if db.health_check():
-            print("✓ Database connection successful")
-        else:
-            print("✗ Database connection failed")
-            return False
     except Exception as e:
-        print(f"✗ Database error: {e}")
-        return False
+        pytest.skip(f"Database error: {e}")
+    if not db.health_check():
+        pytest.skip("Database connection failed")
+    return db
+
+
+def test_config_loaded(settings_fx):
+    """Test config loading"""
+    assert settings_fx.service_name
+    assert settings_fx.database_url
+    print(f"✓ Config loaded: {settings_fx.service_name} v{settings_fx.service_version}")
+    print(f"  Environment: {settings_fx.environment}")
+    print(f"  Database URL: {settings_fx.database_url[:30]}...")
+
+
+def test_db_health(db_fx):
+    """Test database connection"""
+    assert db_fx.health_check()
+    print("✓ Database connection successful")
+
+
+def test_pending_job_shape(db_fx):
+    """Check the oldest pending job has the fields the processor reads (without claiming it)"""
+    with db_fx.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, area_id, profile, params, created_at
+                FROM coverage_routes
+                WHERE status IN ('pending', 'queued')
+                ORDER BY created_at ASC
+                LIMIT 1
+            """)
+            job = cur.fetchone()
     
-    # Check for pending jobs
-    try:
-        job = db.get_pending_job()
-        if job:
-            print(f"✓ Found pending job: {job['id']}")
-            print(f"  Area: {job['area_id']}")
-            print(f"  Status: {job['params'].get('status', 'unknown')}")
-        else:
-            print("ℹ No pending jobs found")
-    except Exception as e:
-        print(f"✗ Error checking jobs: {e}")
+    if not job:
+        pytest.skip("No pending jobs found")
     
-    # Test area fetching
-    try:
-        # Get first area from database
-        with db.get_connection() as conn:
-            with conn.cursor() as cur:
-                cur.execute("SELECT id, name FROM areas LIMIT 1")
-                area = cur.fetchone()
-                if area:
-                    print(f"✓ Found area: {area['name']} ({area['id']})")
-                    
-                    # Test fetching full area data
-                    area_data = db.get_area_data(area['id'])
-                    if area_data:
-                        print(f"  Geometry type: {area_data['geojson']['type']}")
-                        print(f"  Buffer: {area_data['buffer_m']}m")
-                else:
-                    print("ℹ No areas found in database")
-    except Exception as e:
-        print(f"✗ Error fetching areas: {e}")
+    assert job['id'] and job['area_id']
+    print(f"✓ Found pending job: {job['id']}")
+    print(f"  Area: {job['area_id']}")
+
+
+def test_area_fetch(db_fx):
+    """Test area fetching"""
+    # Get first area from database
+    with db_fx.get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT id, name FROM areas LIMIT 1")
+            area = cur.fetchone()
     
-    print("\n✅ Worker test complete!")
-    return True
+    if not area:
+        pytest.skip("No areas found in database")
+    print(f"✓ Found area: {area['name']} ({area['id']})")
+    
+    # Test fetching full area data
+    area_data = db_fx.get_area_data(area['id'])
+    assert area_data
+    assert area_data['geojson']['type']
+    print(f"  Geometry type: {area_data['geojson']['type']}")
+    print(f"  Buffer: {area_data['buffer_m']}m")
+
 
 if __name__ == "__main__":
-    success = test_connection()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
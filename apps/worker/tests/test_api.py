@@ -0,0 +1,167 @@
+"""
+Tests for the generate-route HTTP endpoints (route calculation stubbed out)
+"""
+
+import json
+import pytest
+import shapely
+from unittest.mock import AsyncMock, patch
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+
+
+ROUTE = {
+    'geometry': {'type': 'LineString', 'coordinates': [[0.0, 0.0], [0.001, 0.0], [0.001, 0.001]]},
+    'gaps': [],
+    'length_m': 222.4,
+    'drive_time_s': 22.2,
+    'statistics': {'total_edges': 2},
+    'diagnostics': {}
+}
+
+STREETS = {
+    'type': 'FeatureCollection',
+    'features': [
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'LineString', 'coordinates': [[0, 0], [0.001, 0]]},
+            'properties': {'name': 'Street 1'}
+        },
+        {
+            'type': 'Feature',
+            'geometry': {'type': 'LineString', 'coordinates': [[0.001, 0], [0.001, 0.001]]},
+            'properties': {'name': 'Street 2'}
+        }
+    ]
+}
+
+
+@pytest.fixture
+def client():
+    """Client without lifespan, so no background services or database"""
+    return TestClient(main.app)
+
+
+@pytest.fixture
+def calculate():
+    """Stub route calculation, recording the request bodies it receives"""
+    with patch.object(main, '_calculate_route', AsyncMock(return_value=ROUTE)) as mock:
+        yield mock
+
+
+class TestBatchGenerateRoute:
+    """Test /api/generate-route/batch"""
+    
+    def test_results_in_job_order(self, client, calculate):
+        """Test that each job gets its own result, in request order"""
+        jobs = [{'streets_geojson': STREETS, 'coverage_mode': mode} for mode in (True, False)]
+        
+        resp = client.post('/api/generate-route/batch', json={'jobs': jobs})
+        
+        assert resp.status_code == 200
+        body = resp.json()
+        assert body['success']
+        assert [r['route']['geometry'] for r in body['results']] == [ROUTE['geometry']] * 2
+        assert [c.args[0]['coverage_mode'] for c in calculate.await_args_list] == [True, False]
+    
+    def test_failed_job_reported_separately(self, client, calculate):
+        """Test that one failing job does not fail the others"""
+        calculate.side_effect = [HTTPException(status_code=400, detail="streets_geojson is required"), ROUTE]
+        
+        resp = client.post('/api/generate-route/batch', json={'jobs': [{}, {'streets_geojson': STREETS}]})
+        
+        assert resp.status_code == 200
+        body = resp.json()
+        assert not body['success']
+        assert body['results'][0] == {'success': False, 'error': "streets_geojson is required"}
+        assert body['results'][1]['success']
+    
+    def test_summary(self, client, calculate):
+        """Test that summary jobs report counts and totals without geometry"""
+        resp = client.post('/api/generate-route/batch?summary=1', json={'jobs': [{'streets_geojson': STREETS}]})
+        
+        assert resp.json()['results'][0]['route'] == {
+            'coord_count': 3,
+            'gap_count': 0,
+            'length_m': ROUTE['length_m'],
+            'drive_time_s': ROUTE['drive_time_s']
+        }
+
+
+class TestGeoJSONSequence:
+    """Test application/geo+json-seq bodies on /api/generate-route"""
+    
+    def _post(self, client, body: bytes, query: str = ''):
+        return client.post(
+            f'/api/generate-route{query}',
+            content=body,
+            headers={'Content-Type': main.GEOJSON_SEQ_TYPE}
+        )
+    
+    def test_sequence_matches_json_body(self, client, calculate):
+        """Test that a sequence reaches the calculator as the equivalent JSON body"""
+        records = b''.join(b'\x1e' + json.dumps(f).encode() + b'\n' for f in STREETS['features'])
+        
+        resp = self._post(client, records, '?coverage_mode=false')
+        
+        assert resp.status_code == 200
+        assert resp.json()['route']['geometry'] == ROUTE['geometry']
+        calculate.assert_awaited_once_with({'streets_geojson': STREETS, 'coverage_mode': False})
+    
+    def test_records_split_across_chunks(self, client, calculate):
+        """Test records without RS, blank lines and no trailing newline, streamed in small pieces"""
+        records = b'\n\n'.join(json.dumps(f).encode() for f in STREETS['features'])
+        
+        def pieces():
+            for i in range(0, len(records), 7):
+                yield records[i:i + 7]
+        
+        resp = self._post(client, pieces())
+        
+        assert resp.status_code == 200
+        calculate.assert_awaited_once_with({'streets_geojson': STREETS, 'coverage_mode': True})
+    
+    def test_invalid_record(self, client, calculate):
+        """Test that a malformed record is a 400, not a 500"""
+        resp = self._post(client, b'\x1e{"type": "Feature"\n')
+        
+        assert resp.status_code == 400
+        calculate.assert_not_awaited()
+
+
+class TestWKBGeometry:
+    """Test ?geometry_format=wkb on /api/generate-route"""
+    
+    def test_wkb_round_trip(self, client, calculate):
+        """Test that the WKB body decodes to the route geometry, with the summary in a header"""
+        resp = client.post('/api/generate-route?geometry_format=wkb', json={'streets_geojson': STREETS})
+        
+        assert resp.status_code == 200
+        assert resp.headers['content-type'] == main.WKB_TYPE
+        line = shapely.from_wkb(resp.content)
+        assert shapely.get_coordinates(line).tolist() == ROUTE['geometry']['coordinates']
+        assert json.loads(resp.headers[main.ROUTE_SUMMARY_HEADER]) == {
+            'coord_count': 3,
+            'gap_count': 0,
+            'length_m': ROUTE['length_m'],
+            'drive_time_s': ROUTE['drive_time_s']
+        }
+    
+    def test_short_route_is_empty_linestring(self, client, calculate):
+        """Test that a route under two points encodes as an empty LineString"""
+        calculate.return_value = {**ROUTE, 'geometry': {'type': 'LineString', 'coordinates': [[0.0, 0.0]]}}
+        
+        resp = client.post('/api/generate-route?geometry_format=wkb', json={'streets_geojson': STREETS})
+        
+        line = shapely.from_wkb(resp.content)
+        assert line.geom_type == 'LineString'
+        assert line.is_empty
+    
+    def test_unsupported_format(self, client, calculate):
+        """Test that an unknown geometry_format is rejected before any work"""
+        resp = client.post('/api/generate-route?geometry_format=svg', json={'streets_geojson': STREETS})
+        
+        assert resp.status_code == 400
+        calculate.assert_not_awaited()
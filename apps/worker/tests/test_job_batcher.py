@@ -0,0 +1,58 @@
+"""
+Tests for coalescing manual job submissions
+"""
+
+import pytest
+import asyncio
+
+from app.services.job_batcher import JobBatcher
+
+
+class TestJobBatcher:
+    """Test batching and per-job outcomes"""
+    
+    @pytest.mark.asyncio
+    async def test_long_batch_does_not_block_later_jobs(self):
+        """A job submitted while a slow batch runs completes without waiting for it"""
+        release = asyncio.Event()
+        
+        async def process_jobs(jobs):
+            if any(job['id'] == 'slow' for job in jobs):
+                await release.wait()
+            return [None] * len(jobs)
+        
+        batcher = JobBatcher(process_jobs, max_wait_ms=1)
+        consumer = asyncio.create_task(batcher.run())
+        try:
+            slow = await batcher.submit({'id': 'slow'})
+            await asyncio.sleep(0.01)  # let the slow batch start on its own
+            fast = await batcher.submit({'id': 'fast'})
+            
+            await asyncio.wait_for(fast, timeout=1.0)
+            assert not slow.done()
+            
+            release.set()
+            await asyncio.wait_for(slow, timeout=1.0)
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
+    
+    @pytest.mark.asyncio
+    async def test_failure_is_reported_per_job(self):
+        """Each future gets its own job's outcome"""
+        
+        async def process_jobs(jobs):
+            return [ValueError(job['id']) if job['id'] == 'bad' else None for job in jobs]
+        
+        batcher = JobBatcher(process_jobs, max_wait_ms=50)
+        consumer = asyncio.create_task(batcher.run())
+        try:
+            good = await batcher.submit({'id': 'good'})
+            bad = await batcher.submit({'id': 'bad'})
+            
+            assert await asyncio.wait_for(good, timeout=1.0) is None
+            with pytest.raises(ValueError):
+                await asyncio.wait_for(bad, timeout=1.0)
+        finally:
+            consumer.cancel()
+            await asyncio.gather(consumer, return_exceptions=True)
@@ -5,9 +5,11 @@ Tests for route generation with proper Chinese Postman algorithm
 import pytest
 import asyncio
 import networkx as nx
+import numpy as np
 from unittest.mock import Mock, AsyncMock, patch
 from shapely.geometry import LineString, Point
 
+from app.services._geo_numba import segment_lengths
 from app.services.graph_builder import GraphBuilder
 from app.services.route_connector import RouteConnector
 from app.services.route_calculator import RouteCalculator
@@ -106,6 +108,18 @@ class TestGraphBuilder:
                   for n in G.nodes())
 
 
+def _random_strong_digraph(seed: int, n: int = 12, extra: int = 20) -> nx.MultiDiGraph:
+    """Random strongly connected, unbalanced multigraph: a ring plus random chords"""
+    rng = np.random.default_rng(seed)
+    G = nx.MultiDiGraph()
+    for i in range(n):
+        G.add_edge(i, (i + 1) % n, length=float(rng.uniform(10, 100)))
+    for _ in range(extra):
+        u, v = rng.choice(n, size=2, replace=False)
+        G.add_edge(int(u), int(v), length=float(rng.uniform(10, 100)))
+    return G
+
+
 class TestRouteConnector:
     """Test component connection and gap bridging"""
     
@@ -181,7 +195,7 @@ class TestRouteConnector:
         
         circuit = [((0, 0), (0, 1)), ((0.5, 1), (1, 1))]
         
-        coords = await connector.bridge_route_gaps(G, circuit, max_gap=30)
+        coords, _ = await connector.bridge_route_gaps(G, circuit, max_gap=30)
         
         # Should have bridged the gap
         assert len(coords) > 4  # More than just the original 4 points
@@ -266,6 +280,80 @@ class TestRouteCalculator:
         
         assert len(circuit) == 4  # Should visit all 4 edges
     
+    def test_multi_source_dijkstra_matches_networkx(self):
+        """Test compiled Dijkstra distances against networkx, with parallel and zero-length edges"""
+        mock_ors = Mock(spec=ORSClient)
+        calculator = RouteCalculator(ors_client=mock_ors)
+        
+        G = _random_strong_digraph(seed=1)
+        G.add_edge(0, 1, length=0.0)  # Zero-length parallel edge must stay usable
+        
+        nodes = list(G.nodes())
+        node_idx = {v: i for i, v in enumerate(nodes)}
+        edge_u, edge_v, edge_len = calculator._edge_arrays(G, node_idx)
+        sources = [0, 3, 7]
+        
+        dist, pred = calculator._multi_source_dijkstra(len(nodes), edge_u, edge_v, edge_len, sources)
+        
+        for row, s in enumerate(sources):
+            expected = nx.single_source_dijkstra_path_length(G, nodes[s], weight='length')
+            for v, d in expected.items():
+                assert dist[row, node_idx[v]] == pytest.approx(d, abs=1e-6)
+                # Traced path is a real path of the same length
+                path = calculator._trace_path(pred[row], s, node_idx[v], nodes)
+                walked = sum(
+                    min(e['length'] for e in G.get_edge_data(a, b).values())
+                    for a, b in zip(path, path[1:])
+                )
+                assert walked == pytest.approx(d, abs=1e-6)
+    
+    def test_balance_directed_matches_networkx_min_cost_flow(self):
+        """Test Eulerization cost against per-node networkx Dijkstra + min-cost flow"""
+        mock_ors = Mock(spec=ORSClient)
+        calculator = RouteCalculator(ors_client=mock_ors)
+        
+        for seed in range(20):
+            G = _random_strong_digraph(seed=seed)
+            
+            # Reference: the networkx formulation the scipy version replaced
+            balance = {v: G.out_degree(v) - G.in_degree(v) for v in G}
+            F = nx.DiGraph()
+            for v, b in balance.items():
+                if b:
+                    F.add_node(v, demand=b)
+            for s in (v for v, b in balance.items() if b < 0):
+                lengths = nx.single_source_dijkstra_path_length(G, s, weight='length')
+                for d in (v for v, b in balance.items() if b > 0):
+                    F.add_edge(s, d, weight=int(lengths[d] * 1000))
+            expected_cost = nx.cost_of_flow(F, nx.min_cost_flow(F)) if F else 0
+            
+            G_eulerian, stats = calculator._balance_directed(G)
+            
+            assert calculator._validate_eulerian_directed(G_eulerian)
+            assert G_eulerian.number_of_edges() == G.number_of_edges() + stats.get('edges_added', 0)
+            # Same optimum, up to the millimetre rounding of flow costs
+            assert stats['duplicated_length_m'] == pytest.approx(expected_cost / 1000, abs=0.01 * G.number_of_nodes())
+    
+    def test_balance_directed_multi_unit_imbalance(self):
+        """Test that imbalances above one go through min-cost flow and still balance"""
+        mock_ors = Mock(spec=ORSClient)
+        calculator = RouteCalculator(ors_client=mock_ors)
+        
+        # Three spokes out of the hub, one way back through a chain
+        G = nx.MultiDiGraph()
+        for leaf in (1, 2, 3):
+            G.add_edge(0, leaf, length=10.0)
+        G.add_edge(1, 2, length=5.0)
+        G.add_edge(2, 3, length=5.0)
+        G.add_edge(3, 0, length=10.0)
+        
+        G_eulerian, stats = calculator._balance_directed(G)
+        
+        assert calculator._validate_eulerian_directed(G_eulerian)
+        # Hub is short two in-edges, from 2 and 3: 2->3->0 (15) and 3->0 (10)
+        assert stats['duplicated_length_m'] == pytest.approx(25.0)
+        assert stats['edges_added'] == 3
+    
     def test_calculate_route_stats(self):
         """Test route statistics calculation"""
         mock_ors = Mock(spec=ORSClient)
@@ -281,6 +369,22 @@ class TestRouteCalculator:
         # At 10 m/s average speed
         assert 22000 < time < 22500
     
+    def test_validate_continuity_reports_every_gap(self):
+        """Test that every gap is reported, in route order"""
+        mock_ors = Mock(spec=ORSClient)
+        calculator = RouteCalculator(ors_client=mock_ors)
+        
+        # Two large jumps far apart
+        coords = np.array([[i * 0.00001, 0] for i in range(10000)], dtype=np.float64)
+        coords[10:, 1] += 1.0
+        coords[9000:, 1] += 1.0
+        
+        is_valid, violations = calculator._validate_continuity(coords)
+        assert not is_valid
+        assert [idx for idx, _ in violations] == [9, 8999]
+        
+        assert calculator._validate_continuity(coords[:10]) == (True, [])
+    
     def test_split_into_chunks(self):
         """Test route chunking"""
         mock_ors = Mock(spec=ORSClient)
@@ -297,6 +401,37 @@ class TestRouteCalculator:
         assert all('time_s' in chunk for chunk in chunks)
         assert all(chunk['time_s'] <= 1800 * 1.1 for chunk in chunks)  # Allow 10% overage
 
+    
+    def test_split_into_chunks_matches_segment_walk(self):
+        """Test searchsorted chunk boundaries against the per-segment accumulation they replaced"""
+        mock_ors = Mock(spec=ORSClient)
+        calculator = RouteCalculator(ors_client=mock_ors)
+        rng = np.random.default_rng(0)
+        
+        def walk(coords, duration, speed=10.0):
+            # Reference: accumulate segment by segment, resetting at each boundary
+            bounds, start, t = [], 0, 0.0
+            for i, seg in enumerate(segment_lengths(coords)):
+                t += seg / speed
+                if t >= duration:
+                    bounds.append((start, i + 2))
+                    start, t = i + 1, 0.0
+            if coords.shape[0] - start > 1:
+                bounds.append((start, coords.shape[0]))
+            return bounds
+        
+        for duration in (0, 60, 300, 1800):
+            coords = np.cumsum(rng.uniform(-0.002, 0.002, size=(500, 2)), axis=0)
+            chunks = calculator.split_into_chunks(coords, duration, 'driving-car')
+            bounds = walk(coords, duration)
+            
+            assert len(chunks) == len(bounds)
+            for chunk, (a, b) in zip(chunks, bounds):
+                assert chunk['geometry']['coordinates'] == coords[a:b].tolist()
+            # Consecutive chunks share their boundary point
+            for prev, nxt in zip(chunks, chunks[1:]):
+                assert prev['end_point'] == nxt['start_point']
+            assert sum(c['length_m'] for c in chunks) == pytest.approx(float(segment_lengths(coords).sum()))
 
 class TestIntegration:
     """Integration tests for the complete route generation"""
@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 
 # Import just what we need
 import networkx as nx
+import numpy as np
 from pyproj import Geod
 
 GEOD = Geod(ellps="WGS84")
@@ -50,23 +51,8 @@ class SimpleORSClient:
         return [[start[0], start[1]], [end[0], end[1]]], distance
     
     def _haversine(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        """Calculate haversine distance"""
-        from math import radians, sin, cos, atan2, sqrt
-        
-        lon1, lat1 = p1
-        lon2, lat2 = p2
-        
-        R = 6371000  # Earth radius in meters
-        
-        dlat = radians(lat2 - lat1)
-        dlon = radians(lon2 - lon1)
-        lat1_rad = radians(lat1)
-        lat2_rad = radians(lat2)
-        
-        a = sin(dlat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon/2)**2
-        c = 2 * atan2(sqrt(a), sqrt(1-a))
-        
-        return R * c
+        """Calculate geodesic distance in meters"""
+        return GEOD.inv(p1[0], p1[1], p2[0], p2[1])[2]
 
 
 def build_test_graph() -> nx.MultiDiGraph:
@@ -216,30 +202,19 @@ async def test_scc_ordering():
         (0, 10),     # SCC 3
     ]
     
-    # Simple nearest neighbor TSP
+    # Simple nearest neighbor TSP over one broadcast distance matrix
     n = len(centroids)
-    unvisited = set(range(n))
+    pts = np.asarray(centroids, dtype=np.float64)
+    # Simple Euclidean distance
+    d = np.sqrt(np.sum((pts[:, None, :] - pts[None, :, :]) ** 2, axis=-1))
+    visited = np.zeros(n, dtype=bool)
     order = [0]
-    unvisited.remove(0)
+    visited[0] = True
     
-    while unvisited:
-        last_idx = order[-1]
-        last_centroid = centroids[last_idx]
-        
-        best_idx = None
-        best_dist = float('inf')
-        
-        for idx in unvisited:
-            # Simple Euclidean distance
-            dist = ((centroids[idx][0] - last_centroid[0])**2 + 
-                   (centroids[idx][1] - last_centroid[1])**2)**0.5
-            if dist < best_dist:
-                best_dist = dist
-                best_idx = idx
-        
-        if best_idx is not None:
-            order.append(best_idx)
-            unvisited.remove(best_idx)
+    for _ in range(n - 1):
+        best_idx = int(np.argmin(np.where(visited, np.inf, d[order[-1]])))
+        order.append(best_idx)
+        visited[best_idx] = True
     
     logger.info(f"SCC visit order: {order}")
     logger.info("✅ SCC ordering test complete")
@@ -1,45 +1,364 @@
 #!/usr/bin/env python3
-import requests
+"""
+Exercise the worker's /api/generate-route endpoint with a few street layouts
+
+Posts each case concurrently and prints one JSON line per case. Also a pytest
+module (`pytest -n auto test_worker.py`); tests skip when no worker is listening.
+"""
+
+import argparse
+import asyncio
+import gzip
 import json
+import os
+import stat
+import sys
+import time
+
+import httpx
+import numpy as np
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # Falls back to parsing the whole response
+
+try:
+    import pytest
+except ImportError:
+    pytest = None  # Only needed to run the tests below, which are then not defined
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Default asyncio event loop (e.g. on Windows)
+
+try:
+    import shapely
+except ImportError:
+    shapely = None  # Only needed for --wkb
+
+try:
+    import orjson
+    
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    _loads = orjson.loads
+except ImportError:
+    def _ndarray_to_list(obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        raise TypeError(f"{type(obj).__name__} is not JSON serializable")
+    
+    def _dumps(obj):
+        return json.dumps(obj, default=_ndarray_to_list).encode()
+    _loads = json.loads
+
+BASE_URL = "http://localhost:8000"
+# Co-located worker's Unix socket (default /tmp/scanneo.sock); falls back to TCP localhost:8000 when absent
+WORKER_UDS = os.environ.get("WORKER_UDS", "/tmp/scanneo.sock")
+URL = f"{BASE_URL}/api/generate-route"
+BATCH_URL = f"{URL}/batch"
+# Request bodies are gzipped at level 1: most of the size win for little CPU
+GZIP_LEVEL = 1
+JSON_HEADERS = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+SEQ_HEADERS = {"Content-Type": "application/geo+json-seq", "Content-Encoding": "gzip"}
+
+# Transient worker/proxy failures are retried with exponential backoff
+RETRY_STATUSES = frozenset({502, 503, 504})
+MAX_RETRIES = 3
+RETRY_BACKOFF_S = 0.2
+
+
+def _street(name, coordinates):
+    """LineString street feature; coordinates are kept as one (N, 2) float64 array"""
+    return {
+        "type": "Feature",
+        "properties": {"name": name},
+        "geometry": {
+            "type": "LineString",
+            "coordinates": np.asarray(coordinates, dtype=np.float64)
+        }
+    }
+
 
 # Test with disconnected streets
-geojson = {
+DISCONNECTED = {
     "type": "FeatureCollection",
     "features": [
-        {
-            "type": "Feature",
-            "properties": {"name": "Street 1"},
-            "geometry": {
-                "type": "LineString",
-                "coordinates": [[-1.06, 50.80], [-1.055, 50.805]]
-            }
-        },
-        {
-            "type": "Feature",
-            "properties": {"name": "Street 2 (disconnected)"},
-            "geometry": {
-                "type": "LineString",
-                "coordinates": [[-1.05, 50.81], [-1.045, 50.815]]
-            }
-        }
+        _street("Street 1", [[-1.06, 50.80], [-1.055, 50.805]]),
+        _street("Street 2 (disconnected)", [[-1.05, 50.81], [-1.045, 50.815]])
     ]
 }
 
-response = requests.post(
-    "http://localhost:8000/api/generate-route",
-    json={
-        "streets_geojson": geojson,
-        "coverage_mode": True
+# Same area, with the streets sharing an end point
+CONNECTED = {
+    "type": "FeatureCollection",
+    "features": [
+        _street("Street 1", [[-1.06, 50.80], [-1.055, 50.805]]),
+        _street("Street 2 (connected)", [[-1.055, 50.805], [-1.05, 50.81]])
+    ]
+}
+
+CASES = [
+    ("disconnected, coverage", {"streets_geojson": DISCONNECTED, "coverage_mode": True}),
+    ("disconnected, no coverage", {"streets_geojson": DISCONNECTED, "coverage_mode": False}),
+    ("connected, coverage", {"streets_geojson": CONNECTED, "coverage_mode": True}),
+]
+
+
+class _AsyncBody:
+    """Async file-like view of a streaming httpx response, for ijson"""
+    
+    def __init__(self, response):
+        self._chunks = response.aiter_bytes()
+    
+    async def read(self, size=-1):
+        # ijson probes with read(0) to detect bytes vs str
+        if size == 0:
+            return b""
+        return await anext(self._chunks, b"")
+
+
+def _summary(data):
+    """Summary of one parsed route response"""
+    route = data.get('route')
+    return {
+        'success': data.get('success'),
+        'error': data.get('error'),
+        'route': bool(route),
+        'points': route.get('coord_count', 0) if route else 0,
+        'gaps': route.get('gap_count', 0) if route else 0
     }
-)
-
-print(f"Status: {response.status_code}")
-if response.status_code == 200:
-    data = response.json()
-    print(f"Success: {data.get('success')}")
-    if data.get('route'):
-        route = data['route']
-        print(f"Route points: {len(route.get('geometry', {}).get('coordinates', []))}")
-        print(f"Gaps: {len(route.get('gaps', []))}")
-else:
-    print(f"Error: {response.text}")
\ No newline at end of file
+
+
+async def _read_summaries(response, item_prefix):
+    """
+    Route summaries from a streaming response. item_prefix is '' for one
+    route response or 'results.item' for each route in a batch response.
+    """
+    if ijson is None:
+        data = _loads(await response.aread())
+        return [_summary(d) for d in (data['results'] if item_prefix else [data])]
+    
+    p = f"{item_prefix}." if item_prefix else ""
+    counts = {f"{p}route.coord_count": 'points', f"{p}route.gap_count": 'gaps'}
+    summaries = []
+    async for prefix, event, value in ijson.parse_async(_AsyncBody(response)):
+        if prefix == item_prefix and event == 'start_map':
+            summaries.append({'success': None, 'error': None, 'route': False, 'points': 0, 'gaps': 0})
+        elif prefix in counts and event == 'number':
+            summaries[-1][counts[prefix]] = value
+        elif prefix == f"{p}route" and event == 'start_map':
+            summaries[-1]['route'] = True
+        elif prefix in (f"{p}success", f"{p}error"):
+            summaries[-1][prefix[len(p):]] = value
+    return summaries
+
+
+async def _read_wkb_summary(response):
+    """Route summary from a WKB response: geometry in the body, counts in X-Route-Summary"""
+    meta = _loads(response.headers["X-Route-Summary"])
+    geom = shapely.from_wkb(await response.aread())
+    return [{
+        'success': True,
+        'error': None,
+        'route': True,
+        'points': shapely.get_num_coordinates(geom),
+        'gaps': meta['gap_count']
+    }]
+
+
+def _seq_body(body):
+    """Gzipped GeoJSON text sequence (RFC 8142): one RS-prefixed, LF-terminated record per street"""
+    records = b"".join(b"\x1e" + _dumps(f) + b"\n" for f in body["streets_geojson"]["features"])
+    return gzip.compress(records, compresslevel=GZIP_LEVEL)
+
+
+def _batch_body(cases):
+    """Gzipped JSON batch request for the given cases"""
+    return gzip.compress(_dumps({"jobs": [body for _, body in cases]}), compresslevel=GZIP_LEVEL)
+
+
+# Serialized once; every run and retry re-sends the same bytes
+SEQ_BODIES = {name: _seq_body(body) for name, body in CASES}
+BATCH_BODY = _batch_body(CASES)
+
+
+async def _send(client, url, content, headers, params=None):
+    """
+    POST with a streamed response, retried on RETRY_STATUSES. Returns the
+    open response; the caller closes it.
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        request = client.build_request("POST", url, params=params, content=content, headers=headers)
+        response = await client.send(request, stream=True)
+        if response.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return response
+        await response.aclose()
+        await asyncio.sleep(RETRY_BACKOFF_S * 2 ** attempt)
+
+
+async def _post_for_summaries(client, url, content, headers, read_summaries, params=None):
+    """
+    (status, summaries or error text, elapsed seconds); status is None if
+    the request failed outright. read_summaries(response) parses a 200.
+    """
+    started = time.perf_counter()
+    try:
+        response = await _send(client, url, content, headers, params)
+        try:
+            response.raise_for_status()
+            result = response.status_code, await read_summaries(response)
+        except httpx.HTTPStatusError:
+            await response.aread()
+            result = response.status_code, response.text
+        finally:
+            await response.aclose()
+    except httpx.HTTPError as e:
+        result = None, f"{type(e).__name__}: {e}"
+    return (*result, time.perf_counter() - started)
+
+
+async def run_case(client, name, body, wkb=False):
+    """POST one case; returns (name, status, route summary or error text, elapsed seconds)"""
+    params = {"coverage_mode": "true" if body["coverage_mode"] else "false"}
+    if wkb:
+        params["geometry_format"] = "wkb"
+        read_summaries = _read_wkb_summary
+    else:
+        params["summary"] = "true"
+        read_summaries = lambda response: _read_summaries(response, "")
+    content = SEQ_BODIES.get(name) or _seq_body(body)
+    status, result, elapsed = await _post_for_summaries(
+        client, URL, content, SEQ_HEADERS, read_summaries, params
+    )
+    return name, status, result[0] if status == 200 else result, elapsed
+
+
+async def run_batch(client, cases):
+    """POST every case in one batch request; returns (name, status, summary or error text, elapsed) per case"""
+    content = BATCH_BODY if cases is CASES else _batch_body(cases)
+    status, result, elapsed = await _post_for_summaries(
+        client, BATCH_URL, content, JSON_HEADERS,
+        lambda response: _read_summaries(response, "results.item"), {"summary": "true"}
+    )
+    if status != 200:
+        return [(name, status, result, elapsed) for name, _ in cases]
+    return [(name, status, summary, elapsed) for (name, _), summary in zip(cases, result)]
+
+
+def outcome(name, status, summary, elapsed):
+    """JSON-ready record of one case; summary is error text unless status is 200"""
+    record = {"case": name, "status": status, "elapsed_s": round(elapsed, 3)}
+    if status != 200:
+        record["error"] = summary
+    elif summary['route']:
+        record.update(success=summary['success'], coord_count=summary['points'], gap_count=summary['gaps'])
+    else:
+        record.update(success=summary['success'], error=summary['error'])
+    return record
+
+
+def _worker_socket():
+    """WORKER_UDS if a worker's Unix socket is there, else None"""
+    try:
+        return WORKER_UDS if stat.S_ISSOCK(os.stat(WORKER_UDS).st_mode) else None
+    except OSError:
+        return None
+
+
+def _transport():
+    """
+    Pooled transport; connection failures are retried here, bad statuses by
+    _send. Goes over the worker's Unix socket when there is one, skipping
+    loopback TCP.
+    """
+    limits = httpx.Limits(max_connections=16, max_keepalive_connections=4)
+    return httpx.AsyncHTTPTransport(limits=limits, retries=MAX_RETRIES, uds=_worker_socket())
+
+
+def _client():
+    """Async client for one run; the route solve dominates the read timeout"""
+    timeout = httpx.Timeout(30.0, connect=2.0)
+    return httpx.AsyncClient(transport=_transport(), timeout=timeout)
+
+
+async def _with_client(fn, *args):
+    async with _client() as client:
+        return await fn(client, *args)
+
+
+if pytest is not None:
+    @pytest.fixture(scope="session")
+    def worker():
+        """Skip the tests unless a worker is listening"""
+        try:
+            with httpx.Client(transport=httpx.HTTPTransport(uds=_worker_socket()), timeout=2.0) as client:
+                client.get(f"{BASE_URL}/").raise_for_status()
+        except httpx.HTTPError as e:
+            pytest.skip(f"Worker not reachable at {BASE_URL}: {e}")
+    
+    @pytest.mark.parametrize("name,body", CASES, ids=[name for name, _ in CASES])
+    def test_generate_route(worker, name, body):
+        """Each case routes successfully through the streaming endpoint"""
+        _, status, summary, _ = asyncio.run(_with_client(run_case, name, body))
+        assert status == 200, summary
+        assert summary['success'], summary
+        assert summary['route'] and summary['points'] >= 2
+    
+    @pytest.mark.skipif(shapely is None, reason="shapely not installed")
+    def test_generate_route_wkb(worker):
+        """The WKB geometry decodes to the same route as the summary reports"""
+        name, body = CASES[0]
+        _, status, wkb_summary, _ = asyncio.run(_with_client(run_case, name, body, True))
+        assert status == 200, wkb_summary
+        _, _, summary, _ = asyncio.run(_with_client(run_case, name, body))
+        assert wkb_summary['points'] == summary['points'] >= 2
+    
+    def test_generate_route_batch(worker):
+        """The batch endpoint answers every case, in order"""
+        results = asyncio.run(_with_client(run_batch, CASES))
+        assert [name for name, *_ in results] == [name for name, _ in CASES]
+        for name, status, summary, _ in results:
+            assert status == 200, summary
+            assert summary['success'], name
+
+
+async def warm_up(client):
+    """
+    GET /health before any timed request, so connection setup and the
+    worker's first-request costs stay out of the measurements. Failures
+    are left for the real requests to report.
+    """
+    try:
+        await client.get(f"{BASE_URL}/health", timeout=2.0)
+    except httpx.HTTPError:
+        pass
+
+
+async def main(batch=False, wkb=False):
+    async with _client() as client:
+        await warm_up(client)
+        if batch:
+            results = await run_batch(client, CASES)
+        else:
+            results = await asyncio.gather(*(run_case(client, name, body, wkb) for name, body in CASES))
+    
+    # One write of JSON lines, one per case (e.g. `| jq .gap_count`)
+    sys.stdout.buffer.write(b"".join(_dumps(outcome(*result)) + b"\n" for result in results))
+    sys.stdout.buffer.flush()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch", action="store_true", help="send all cases as one JSON request to the batch endpoint "
+                        "instead of one gzipped GeoJSON text sequence each")
+    parser.add_argument("--wkb", action="store_true", help="fetch route geometry as WKB, with counts in a JSON header "
+                        "(needs shapely)")
+    args = parser.parse_args()
+    if args.wkb and shapely is None:
+        parser.error("--wkb needs shapely")
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    asyncio.run(main(batch=args.batch, wkb=args.wkb))